@@ -26,3 +26,13 @@ docker_build cloudnet/dot dot
 docker_build cloudnet/nwdiag nwdiag
 docker_build cloudnet/plantuml plantuml
 docker_build cloudnet/toscaware toscaware
+
+echo -------------------- TOSCA normative profile snapshots --------------------
+echo Building TOSCA normative profile snapshots...
+# Built by the toscaware Docker image as they depend on its PyYAML version.
+docker run --user "$(id -u)":"$(id -g)" \
+  --volume="$(cd "$(dirname "$0")"; pwd)/cloudnet:/cloudnet" \
+  --rm \
+  cloudnet/toscaware \
+  python /cloudnet/tosca/profile_snapshots.py
+echo
@@ -298,6 +298,10 @@ class TOSCA(object):
     Alloy.declare_signature(Parameter, AbstractProperty)
 
 
+# Alloy signatures declared before any generation.
+PREDECLARED_SIGNATURES = dict(Alloy.the_extends_relation_between_signatures)
+
+
 # TODO: Would be removed.
 def test(stream):
     acs = AlloyCommandScope()
@@ -2033,6 +2037,10 @@ class RelationshipTypeGenerator(ToscaComponentTypeGenerator):
 
 
 class NodeTypeGenerator(ToscaComponentTypeGenerator):
+    # Node types visited by get_required_locations during the current Alloy
+    # generation, reset by AlloyGenerator.generation().
+    already_visited_node_type_names = {}
+
     def get_kind(self):
         return "node"
 
@@ -2299,8 +2307,12 @@ class NodeTypeGenerator(ToscaComponentTypeGenerator):
         }
 
     # NOTE: Following is a heuristic to compute the scope of LG locations.
-    def get_required_locations(self, node_type_name, default_result=1, already_visited_node_type_names = {}):
+    def get_required_locations(self, node_type_name, default_result=1, already_visited_node_type_names=None):
 #        print(f"get_required_locations node_type_name={node_type_name}")
+        if already_visited_node_type_names is None:
+            already_visited_node_type_names = (
+                NodeTypeGenerator.already_visited_node_type_names
+            )
         if node_type_name in already_visited_node_type_names:
             return default_result
         already_visited_node_type_names[node_type_name] = node_type_name
@@ -2330,7 +2342,11 @@ class NodeTypeGenerator(ToscaComponentTypeGenerator):
         # Iterate over derived_from
         derived_from = node_type_yaml.get(DERIVED_FROM)
         if not self.type_system.is_derived_from(derived_from, node_type_name):
-            result = result + self.get_required_locations(derived_from, 0)
+            result = result + self.get_required_locations(
+                derived_from,
+                0,
+                already_visited_node_type_names=already_visited_node_type_names
+            )
         return result
 
     def generate_command_Check_predicates(self, node_type_name, node_type_yaml):
@@ -4030,6 +4046,11 @@ class AlloyGenerator(AbstractAlloySigGenerator):
     def generation(self):
         self.open_file(".als", normalize=True)
 
+        # Forget Alloy signatures declared by previously generated templates.
+        Alloy.the_extends_relation_between_signatures = dict(PREDECLARED_SIGNATURES)
+        # Forget node types visited by previously generated templates.
+        NodeTypeGenerator.already_visited_node_type_names = {}
+
         # Declare Alloy signatures.
         all_the_types = [
             (
@@ -0,0 +1,185 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Build manifest of incremental translations.
+
+The manifest records, for each translated template, the digests of the
+template, of its transitive local imports, of the effective configuration
+and of the generated artifacts, together with the outputs of its
+translation. A template whose digests are unchanged is not translated again,
+its recorded outputs are emitted instead.
+
+Templates importing remote templates are always translated.
+"""
+
+import hashlib  # for hashing files and configurations.
+import json  # for storing the manifest.
+import logging  # for logging purposes.
+import os
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+
+configuration.DEFAULT_CONFIGURATION["logging"]["loggers"][__name__] = {
+    "level": "INFO",
+}
+
+# init logger
+LOGGER = logging.getLogger(__name__)
+
+# Version of the manifest format and of the recorded outputs.
+MANIFEST_VERSION = 1
+
+
+def get_file_digest(filepath):
+    """
+    Returns the digest of a file content, None if it does not exist.
+    """
+    try:
+        with open(filepath, "rb") as stream:
+            return hashlib.sha256(stream.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def get_configuration_digest(config, with_diagnostics):
+    """
+    Returns the digest of an effective configuration.
+    """
+    # Keys are not sorted as they can be of different types, their order is
+    # given by the loading order of modules and configuration files.
+    content = json.dumps(
+        [MANIFEST_VERSION, with_diagnostics, config.configuration], default=str
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_template_files(template_file, import_session):
+    """
+    Returns the digests of a translated template file and of the local files
+    loaded by its import session, None if they can not be recorded.
+    """
+    if importers.is_url(template_file):
+        return None
+    for importer in import_session.get_importers():
+        if importer.already_loaded_tosca_service_templates and not isinstance(
+            importer, importers.FilesystemImporter
+        ):
+            return None
+    files = {os.path.abspath(template_file): get_file_digest(template_file)}
+    for importer, filename, modification_time in import_session.get_local_files():
+        filepath = importer.base_path + filename
+        # Files modified during the translation can not be recorded.
+        if importers.get_modification_time(filepath) != modification_time:
+            return None
+        files[os.path.abspath(filepath)] = get_file_digest(filepath)
+    return files
+
+
+class BuildManifest(object):
+    """
+    Build manifest stored as a JSON file.
+    """
+
+    def __init__(self, filename, config, with_diagnostics):
+        """
+        Constructor.
+        """
+        self.filename = filename
+        self.configuration_digest = get_configuration_digest(config, with_diagnostics)
+        self.entries = {}
+        self.modified = False
+        try:
+            with open(filename, "r") as stream:
+                manifest = json.load(stream)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.entries = manifest["templates"]
+        except (OSError, ValueError, KeyError):
+            pass  # Start a new manifest.
+        LOGGER.debug("%r loaded" % self)
+
+    def __repr__(self):
+        """
+        Textual representation.
+        """
+        return "<BuildManifest filename=%s templates=%d>" % (
+            self.filename,
+            len(self.entries),
+        )
+
+    def get_outputs(self, template_file):
+        """
+        Returns the recorded outputs of a template if unchanged, None otherwise.
+        """
+        entry = self.entries.get(template_file)
+        if (
+            entry is None
+            or entry["directory"] != os.getcwd()
+            or entry["configuration"] != self.configuration_digest
+        ):
+            return None
+        for digests in (entry["files"], entry["artifacts"]):
+            for filepath, digest in digests.items():
+                if get_file_digest(filepath) != digest:
+                    LOGGER.debug(
+                        "%s changed since %s translated" % (filepath, template_file)
+                    )
+                    return None
+        return (
+            entry["return_code"],
+            entry["stdout"],
+            entry["stderr"],
+            entry["diagnostics"],
+            list(entry["artifacts"]),
+        )
+
+    def record(self, template_file, files, outputs):
+        """
+        Records the outputs of a template translation and the digests of its
+        files, as returned by get_template_files().
+        """
+        self.modified = True
+        if files is None:
+            self.entries.pop(template_file, None)
+            return
+        return_code, stdout, stderr, diagnostic_lines, artifacts = outputs
+        self.entries[template_file] = {
+            "directory": os.getcwd(),
+            "configuration": self.configuration_digest,
+            "files": files,
+            "artifacts": {filepath: get_file_digest(filepath) for filepath in artifacts},
+            "return_code": return_code,
+            "stdout": stdout,
+            "stderr": stderr,
+            "diagnostics": diagnostic_lines,
+        }
+
+    def save(self):
+        """
+        Saves the manifest if modified.
+        """
+        if not self.modified:
+            return
+        directory = os.path.dirname(self.filename) or "."
+        os.makedirs(directory, exist_ok=True)
+        importers.write_atomically(
+            directory,
+            self.filename,
+            json.dumps(
+                {"version": MANIFEST_VERSION, "templates": self.entries}, indent=1
+            ).encode(),
+        )
+        self.modified = False
+        LOGGER.debug("%r saved" % self)
@@ -13,6 +13,7 @@
 # Software description: TOSCA to Cloudnet Translator
 ######################################################################
 
+import importlib
 import logging
 import logging.config
 import os
@@ -31,6 +32,7 @@ def load(config_files=[CONFIGURATION_FILE]):
     # Configure logging.
     logging.config.dictConfig(configuration["logging"])
 
+    contents = []
     for config_file in config_files:
         # Load the configuration file if it exists.
         if os.path.exists(config_file):
@@ -39,9 +41,22 @@ def load(config_files=[CONFIGURATION_FILE]):
             with open(config_file, "r") as stream:
                 content = yaml.load(stream, Loader=yaml.SafeLoader)
                 configuration = merge_dict(configuration, content)
+                contents.append(content)
 
     # Return the configuration.
-    return Configuration(configuration)
+    return Configuration(configuration, contents)
+
+
+def import_library(module_name):
+    """
+    Import a library after logging was configured, and disable its loggers as
+    logging configuration does for the loggers existing at that time.
+    """
+    existing_loggers = set(logging.root.manager.loggerDict)
+    module = importlib.import_module(module_name)
+    for logger in logging.root.manager.loggerDict.keys() - existing_loggers:
+        logging.getLogger(logger).disabled = True
+    return module
 
 
 class Configuration(object):
@@ -49,8 +64,33 @@ class Configuration(object):
     This is a class for managing configuration.
     """
 
-    def __init__(self, configuration):
+    def __init__(self, configuration, contents=[]):
         self.configuration = configuration
+        # Contents of the loaded configuration files.
+        self.contents = contents
+        # Default configurations registered later by imported modules are merged then.
+        self.default_keys = set(DEFAULT_CONFIGURATION)
+        self.default_loggers = set(DEFAULT_CONFIGURATION["logging"]["loggers"])
+
+    def import_module(self, module_name):
+        """
+        Import a module after this configuration was loaded, e.g., a generator
+        imported only when needed, and merge the default configuration it
+        registers with the loaded configuration files.
+        """
+        module = importlib.import_module(module_name)
+        for key in DEFAULT_CONFIGURATION.keys() - self.default_keys:
+            self.default_keys.add(key)
+            configuration = {key: DEFAULT_CONFIGURATION[key]}
+            for content in self.contents:
+                if isinstance(content, dict) and key in content:
+                    configuration = merge_dict(configuration, {key: content[key]})
+            self.configuration[key] = configuration[key]
+        loggers = DEFAULT_CONFIGURATION["logging"]["loggers"]
+        for logger in loggers.keys() - self.default_loggers:
+            self.default_loggers.add(logger)
+            logging.getLogger(logger).setLevel(loggers[logger]["level"])
+        return module
 
     def get(self, *path):
         result = self.configuration
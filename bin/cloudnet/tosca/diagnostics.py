@@ -24,6 +24,7 @@ from cloudnet.tosca.yaml_line_numbering import Coord
 outfile = None  # file object to output to
 template = ""  # name of the template file
 return_code = 0  # all OK by default
+artifacts = None  # paths of the generated artifacts if recorded
 
 
 def configure(template_filename, log_filename):
@@ -33,6 +34,23 @@ def configure(template_filename, log_filename):
         outfile = open(log_filename, "a")
 
 
+def reset(template_filename):
+    """
+    Start the diagnostics of a new template, e.g., in batch mode.
+    """
+    global return_code, template
+    template = template_filename
+    return_code = 0
+
+
+def artifact(filepath):
+    """
+    Record the path of a generated artifact.
+    """
+    if artifacts is not None:
+        artifacts.append(filepath)
+
+
 def diagnostic(gravity, file, message, cls, value=None, **kwargs):
     global return_code, outfile, template
     if gravity == "info" or outfile is None:
@@ -13,13 +13,47 @@
 # Software description: TOSCA to Cloudnet Translator
 ######################################################################
 
+import concurrent.futures  # for prefetching HTTP imports.
+import copy
+import hashlib  # for hashing YAML contents.
+import json  # for storing HTTP cache entries.
 import logging  # for logging purposes.
+import mmap  # for mapping archive files into memory.
+import os
+import pickle  # for storing parsed YAML contents.
+import struct  # for reading ZIP local file headers.
+import tempfile
+import threading
+import time
 import zipfile  # for reading ZIP files.
+import zlib  # for decompressing ZIP entries.
 
 import cloudnet.tosca.configuration as configuration
-import requests  # for HTTP GET requests.
 import yaml  # for parsing YAML.
-from cloudnet.tosca.yaml_line_numbering import SafeLineLoader, StrCoord
+from cloudnet.tosca.yaml_line_numbering import LOADER_VERSION, StrCoord, safe_line_load
+
+IMPORTER = "Importer"
+CACHE_DIRECTORY = "cache-directory"
+PREFETCH_WORKERS = "prefetch-workers"
+HTTP_CACHE_DIRECTORY = "http-cache-directory"
+HTTP_CACHE_TTL = "http-cache-ttl"
+OFFLINE = "offline"
+ARCHIVE_PARALLEL_ENTRIES = "archive-parallel-entries"
+configuration.DEFAULT_CONFIGURATION[IMPORTER] = {
+    # Directory of the persistent cache of parsed YAML files, None to disable it.
+    CACHE_DIRECTORY: None,
+    # Number of threads prefetching HTTP imports, 0 to disable prefetching.
+    PREFETCH_WORKERS: 8,
+    # Directory of the persistent cache of HTTP imports, None to disable it.
+    HTTP_CACHE_DIRECTORY: None,
+    # Seconds during which cached HTTP imports are used without revalidation.
+    HTTP_CACHE_TTL: 3600,
+    # Serve HTTP imports only from the HTTP cache.
+    OFFLINE: False,
+    # Minimal number of YAML entries of archives whose imports are parsed by
+    # the prefetching threads, None to disable it as parsing holds the GIL.
+    ARCHIVE_PARALLEL_ENTRIES: None,
+}
 
 configuration.DEFAULT_CONFIGURATION["logging"]["loggers"][__name__] = {
     "level": "INFO",
@@ -28,6 +62,434 @@ configuration.DEFAULT_CONFIGURATION["logging"]["loggers"][__name__] = {
 # init logger
 LOGGER = logging.getLogger(__name__)
 
+# Persistent cache of parsed YAML files if enabled.
+yaml_cache = None
+
+# Prefetcher of HTTP imports if enabled.
+prefetcher = None
+
+# Persistent cache of HTTP imports if enabled.
+http_cache = None
+
+# Minimal number of YAML entries of archives whose imports are prefetched.
+archive_parallel_entries = None
+
+
+def configure(config):
+    """
+    Configure importers according to the configuration.
+    """
+    global yaml_cache, prefetcher, http_cache, archive_parallel_entries
+    cache_directory = config.get(IMPORTER, CACHE_DIRECTORY)
+    if cache_directory is None:
+        yaml_cache = None
+    else:
+        yaml_cache = YamlCache(cache_directory)
+    http_cache_directory = config.get(IMPORTER, HTTP_CACHE_DIRECTORY)
+    if http_cache_directory is None:
+        http_cache = None
+    else:
+        http_cache = HttpCache(
+            http_cache_directory,
+            config.get(IMPORTER, HTTP_CACHE_TTL),
+            config.get(IMPORTER, OFFLINE),
+        )
+    prefetch_workers = config.get(IMPORTER, PREFETCH_WORKERS)
+    if prefetcher is not None:
+        prefetcher.shutdown()
+    if not prefetch_workers:
+        prefetcher = None
+    else:
+        prefetcher = Prefetcher(prefetch_workers)
+    archive_parallel_entries = config.get(IMPORTER, ARCHIVE_PARALLEL_ENTRIES)
+
+
+def import_requests():
+    """
+    Imports requests when first needed as it is slow to import.
+    """
+    return configuration.import_library("requests")
+
+
+def write_atomically(directory, filename, data):
+    """
+    Writes a file atomically as it could be concurrently read.
+    """
+    fd, temporary_filename = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            stream.write(data)
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        os.remove(temporary_filename)
+        raise
+
+
+class YamlCache(object):
+    """
+    Persistent cache of parsed YAML contents keyed by their content hash.
+
+    Parsed contents are stored as pickles, so the cache directory must not be
+    writable by untrusted users.
+    """
+
+    def __init__(self, directory):
+        """
+        Constructor.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        LOGGER.debug("%r created" % self)
+
+    def __repr__(self):
+        """
+        Textual representation.
+        """
+        return "<YamlCache directory=%s>" % self.directory
+
+    def get_filename(self, content):
+        """
+        Get the cache file of a YAML content.
+        """
+        return os.path.join(
+            self.directory,
+            "%s-%d-%s.pickle"
+            % (hashlib.sha256(content).hexdigest(), LOADER_VERSION, yaml.__version__),
+        )
+
+    def load(self, content):
+        """
+        Loads a YAML content from the cache, parse and store it if not cached.
+        """
+        filename = self.get_filename(content)
+        try:
+            with open(filename, "rb") as stream:
+                return pickle.load(stream)
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            LOGGER.warning("%s ignored: %s" % (filename, exc))
+
+        result = safe_line_load(content)
+
+        try:
+            write_atomically(
+                self.directory,
+                filename,
+                pickle.dumps(result, pickle.HIGHEST_PROTOCOL),
+            )
+        except Exception as exc:
+            LOGGER.warning("%s not cached: %s" % (filename, exc))
+        return result
+
+
+def parse_yaml(content):
+    """
+    Parses a YAML content given as bytes, or loads it from the cache if enabled.
+    """
+    if yaml_cache is None:
+        return safe_line_load(content)
+    return yaml_cache.load(content)
+
+
+class HttpCache(object):
+    """
+    Persistent cache of YAML files got over HTTP.
+
+    Each cached URL has an entry file storing its ETag, Last-Modified and
+    fetch date, and referencing its content file. Entries younger than the
+    TTL are used as is, older ones are revalidated with conditional requests.
+    In offline mode, only cached entries are used whatever their age.
+    Parsed contents are reused thanks to the YAML cache, which is stored in
+    the HTTP cache directory when not configured.
+    """
+
+    def __init__(self, directory, ttl, offline):
+        """
+        Constructor.
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        self.yaml_cache = yaml_cache or YamlCache(directory)
+        LOGGER.debug("%r created" % self)
+
+    def __repr__(self):
+        """
+        Textual representation.
+        """
+        return "<HttpCache directory=%s ttl=%s offline=%s>" % (
+            self.directory,
+            self.ttl,
+            self.offline,
+        )
+
+    def get_entry_filename(self, url):
+        """
+        Get the entry file of a URL.
+        """
+        return os.path.join(
+            self.directory, hashlib.sha256(url.encode()).hexdigest() + ".json"
+        )
+
+    def get_content_filename(self, digest):
+        """
+        Get the content file of a content digest.
+        """
+        return os.path.join(self.directory, digest + ".yaml")
+
+    def read(self, url):
+        """
+        Reads the cache entry and content of a URL, None if not cached.
+        """
+        try:
+            with open(self.get_entry_filename(url)) as stream:
+                entry = json.load(stream)
+            with open(self.get_content_filename(entry["content"]), "rb") as stream:
+                return entry, stream.read()
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            LOGGER.warning("%s cache entry ignored: %s" % (url, exc))
+            return None
+
+    def write(self, url, entry, content=None):
+        """
+        Writes the cache entry of a URL, and its content if given.
+        """
+        try:
+            if content is not None:
+                write_atomically(
+                    self.directory, self.get_content_filename(entry["content"]), content
+                )
+            write_atomically(
+                self.directory,
+                self.get_entry_filename(url),
+                json.dumps(entry).encode(),
+            )
+        except Exception as exc:
+            LOGGER.warning("%s not cached: %s" % (url, exc))
+
+    def get(self, session, url):
+        """
+        Gets and parses a YAML file from the cache or over HTTP.
+        """
+        cached = self.read(url)
+        if cached is not None:
+            entry, content = cached
+            if self.offline or time.time() - entry["date"] < self.ttl:
+                LOGGER.debug("%s got from the HTTP cache" % url)
+                return self.yaml_cache.load(content)
+        elif self.offline:
+            raise FileNotFoundError(url)
+
+        headers = {}
+        if cached is not None:
+            if entry.get("etag") is not None:
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last-modified") is not None:
+                headers["If-Modified-Since"] = entry["last-modified"]
+        requests = import_requests()
+
+        try:
+            response = session.get(url, headers=headers)
+        except requests.exceptions.ConnectionError:
+            if cached is None:
+                raise FileNotFoundError(url)
+            LOGGER.warning("%s unreachable, stale cached content used" % url)
+            return self.yaml_cache.load(content)
+
+        if response.status_code == 304 and cached is not None:
+            LOGGER.debug("%s revalidated in the HTTP cache" % url)
+            entry["date"] = time.time()
+            self.write(url, entry)
+            return self.yaml_cache.load(content)
+        if response.status_code == 404:
+            raise FileNotFoundError(url)
+        if response.status_code != 200:
+            if cached is None:
+                return parse_yaml(response.content)
+            LOGGER.warning(
+                "%s answered HTTP status %d, stale cached content used"
+                % (url, response.status_code)
+            )
+            return self.yaml_cache.load(content)
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last-modified": response.headers.get("Last-Modified"),
+            "date": time.time(),
+            "content": hashlib.sha256(response.content).hexdigest(),
+        }
+        self.write(url, entry, response.content)
+        return self.yaml_cache.load(response.content)
+
+
+def get_url(session, url):
+    """
+    Gets and parses a YAML file over HTTP, or from the HTTP cache if enabled.
+    """
+    if http_cache is not None:
+        return http_cache.get(session, url)
+    requests = import_requests()
+
+    try:
+        response = session.get(url)
+    except requests.exceptions.ConnectionError:
+        raise FileNotFoundError(url)
+    if response.status_code == 404:
+        raise FileNotFoundError(url)
+    return parse_yaml(response.content)
+
+
+class Prefetcher(object):
+    """
+    Fetches concurrently the HTTP imports of loaded TOSCA service templates.
+
+    Each loaded template is scanned for its imports. Imports resolved as HTTP
+    URLs are fetched and parsed by a pool of threads sharing a pooled HTTP
+    session, and their own imports are scanned in turn. Prefetched contents
+    are consumed by UrlImporter.load_yaml, so they enter the usual cache of
+    already loaded TOSCA service templates only when they are imported.
+    """
+
+    def __init__(self, workers):
+        """
+        Constructor.
+        """
+        self.workers = workers
+        # HTTP session created when first needed.
+        self.session = None
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            workers, thread_name_prefix="prefetch"
+        )
+        self.lock = threading.Lock()
+        LOGGER.debug("%r created" % self)
+
+    def __repr__(self):
+        """
+        Textual representation.
+        """
+        return "<Prefetcher workers=%d>" % self.workers
+
+    def get_session(self):
+        """
+        Returns the pooled HTTP session, created at first call.
+        """
+        with self.lock:
+            if self.session is None:
+                requests = import_requests()
+
+                self.session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.workers, pool_maxsize=self.workers
+                )
+                self.session.mount("http://", adapter)
+                self.session.mount("https://", adapter)
+            return self.session
+
+    def shutdown(self):
+        """
+        Stops prefetching.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, session, url):
+        """
+        Gets and parses a YAML file over HTTP, waiting for it if prefetched
+        for the import session.
+        """
+        with self.lock:
+            future = session.prefetches.get(url)
+            # Keep the URL as prefetched once consumed.
+            session.prefetches[url] = None
+        if future is None:
+            return get_url(self.get_session(), url)
+        LOGGER.debug("prefetched %s consumed" % url)
+        return future.result()
+
+    def prefetch(self, session, url, alias):
+        """
+        Fetches, parses and scans a YAML file.
+        """
+        yaml_content = get_url(self.get_session(), url)
+        with self.lock:
+            if url not in session.prefetches:
+                return yaml_content  # Dropped as the session ended.
+        self.prefetch_imports(session, yaml_content, url[: url.rfind("/") + 1], alias)
+        return yaml_content
+
+    def prefetch_imports(self, session, yaml_content, base_path, alias):
+        """
+        Prefetches for the import session the HTTP imports of a YAML content
+        loaded from base_path.
+        """
+        for url in get_import_paths(yaml_content, alias):
+            if not is_url(url):
+                if not is_url(base_path):
+                    continue
+                url = base_path + url
+            with self.lock:
+                if url in session.prefetches:
+                    continue
+                try:
+                    session.prefetches[url] = self.executor.submit(
+                        self.prefetch, session, url, alias
+                    )
+                except RuntimeError:
+                    return  # Prefetching was shut down.
+            LOGGER.debug("prefetch %s" % url)
+
+    def drop(self, session):
+        """
+        Drops the imports prefetched but not consumed by the import session.
+        """
+        with self.lock:
+            futures = [
+                future for future in session.prefetches.values() if future is not None
+            ]
+            session.prefetches = {}
+        for future in futures:
+            future.cancel()
+        if futures:
+            LOGGER.debug(
+                "%d prefetched imports dropped from %r" % (len(futures), session)
+            )
+
+
+def is_url(path):
+    return path.startswith("http:") or path.startswith("https:")
+
+
+def get_import_paths(yaml_content, alias):
+    """
+    Iterates over the import paths of a YAML content, with their repository
+    and alias resolved, skipping invalid imports reported by checkers.
+    """
+    import cloudnet.tosca.syntax as syntax
+
+    if not isinstance(yaml_content, dict):
+        return
+    try:
+        imports = syntax.get_imports(yaml_content)
+        repositories = syntax.get_repositories(yaml_content)
+    except ValueError:
+        return
+    for import_yaml in imports:
+        # Resolve the import as Processor.get_import_full_filepath does.
+        path = syntax.get_import_file(import_yaml)
+        if not isinstance(path, str):
+            continue
+        repository = syntax.get_import_repository(import_yaml)
+        if repository is not None:
+            repository_url = syntax.get_repository_url(repositories.get(repository))
+            if not isinstance(repository_url, str):
+                continue
+            path = repository_url + "/" + path
+        # Resolve aliased files as Importer.imports does.
+        path = alias.get(path, path)
+        yield path
+
 
 class ToscaServiceTemplate(object):
     """
@@ -73,10 +535,10 @@ class Importer(object):
     Abstract base class for importers of TOSCA service templates.
     """
 
-    # Root importer used to load HTTP and aliased templates.
-    root_importer = None
+    # Lock of the children importers and loaded templates of all importers.
+    lock = threading.Lock()
 
-    def __init__(self, base_path, alias={}):
+    def __init__(self, base_path, alias={}, session=None):
         """
         Constructor.
         """
@@ -86,9 +548,12 @@ class Importer(object):
         self.already_loaded_tosca_service_templates = {}
         # Init the cache of children importers.
         self.children_importers = {}
-        # Store the first created imported as the root importer.
-        if Importer.root_importer is None:
-            Importer.root_importer = self
+        # Init the modification times of loaded local files.
+        self.modification_times = {}
+        # Without session, this importer is the root importer of a new session.
+        if session is None:
+            session = ImportSession(alias, self)
+        self.session = session
         LOGGER.debug("%r created" % self)
 
     def __repr__(self):
@@ -106,37 +571,7 @@ class Importer(object):
         """
         LOGGER.debug("import %s from %r" % (path, self))
 
-        # Try to resolve aliased files.
-        filepath = Importer.root_importer.alias.get(path)
-        if filepath is not None:
-            return Importer.root_importer.imports(filepath)
-
-        # Cut the path into its base path and file name.
-        index = path.rfind("/")
-        base_path = path[: index + 1]
-        filename = path[index + 1 :]
-
-        # if not / in path then use the current importer.
-        if base_path == "":
-            importer = self
-        # if path is an url then reuse or create an URL importer.
-        elif base_path.startswith("file:"):
-            base_path = base_path[len("file:") :]
-            importer = Importer.root_importer.children_importers.get(base_path)
-            if importer is None:
-                importer = FilesystemImporter(base_path)
-                Importer.root_importer.children_importers[base_path] = importer
-        elif base_path.startswith("http:") or base_path.startswith("https:"):
-            importer = Importer.root_importer.children_importers.get(base_path)
-            if importer is None:
-                importer = UrlImporter(base_path)
-                Importer.root_importer.children_importers[base_path] = importer
-        # else reuse or create an importer of the same type of the current importer.
-        else:
-            importer = self.children_importers.get(base_path)
-            if importer is None:
-                importer = self.new_importer(base_path)
-                self.children_importers[base_path] = importer
+        importer, filename = self.get_importer(path)
 
         # Is this tosca service template already loaded?
         tosca_service_template = importer.already_loaded_tosca_service_templates.get(
@@ -191,16 +626,51 @@ class Importer(object):
                     )
                 )
 
-        # Create the TOSCA service template.
-        tosca_service_template = ToscaServiceTemplate(filename, yaml_content, importer)
+        # Prefetch the imports of the loaded YAML content.
+        importer.prefetch_imports(yaml_content)
 
-        # Store the loaded tosca service template.
-        importer.already_loaded_tosca_service_templates[
-            filename
-        ] = tosca_service_template
+        # Create and store the TOSCA service template.
+        return importer.install(filename, yaml_content)
 
-        # Return the TOSCA service template.
-        return tosca_service_template
+    def get_importer(self, path):
+        """
+        Returns the importer of a path and the file name to import from it.
+        """
+        # Try to resolve aliased files.
+        root_importer = self.session.root_importer
+        filepath = root_importer.alias.get(path)
+        if filepath is not None:
+            return root_importer.get_importer(filepath)
+
+        # Cut the path into its base path and file name.
+        index = path.rfind("/")
+        base_path = path[: index + 1]
+        filename = path[index + 1 :]
+
+        # Children importers are shared by threads loading templates.
+        with Importer.lock:
+            # if not / in path then use the current importer.
+            if base_path == "":
+                importer = self
+            # if path is an url then reuse or create an URL importer.
+            elif base_path.startswith("file:"):
+                base_path = base_path[len("file:") :]
+                importer = root_importer.children_importers.get(base_path)
+                if importer is None:
+                    importer = FilesystemImporter(base_path, session=self.session)
+                    root_importer.children_importers[base_path] = importer
+            elif base_path.startswith("http:") or base_path.startswith("https:"):
+                importer = root_importer.children_importers.get(base_path)
+                if importer is None:
+                    importer = UrlImporter(base_path, session=self.session)
+                    root_importer.children_importers[base_path] = importer
+            # else reuse or create an importer of the same type of the current importer.
+            else:
+                importer = self.children_importers.get(base_path)
+                if importer is None:
+                    importer = self.new_importer(base_path)
+                    self.children_importers[base_path] = importer
+        return importer, filename
 
     def new_importer(self, path):
         """
@@ -208,6 +678,56 @@ class Importer(object):
         """
         raise NotImplementedError()
 
+    def install(self, filename, yaml_content, modification_time=None):
+        """
+        Installs an already parsed TOSCA service template unless concurrently
+        loaded, returns the loaded one.
+        """
+        tosca_service_template = ToscaServiceTemplate(filename, yaml_content, self)
+        with Importer.lock:
+            tosca_service_template = (
+                self.already_loaded_tosca_service_templates.setdefault(
+                    filename, tosca_service_template
+                )
+            )
+            if modification_time is not None:
+                self.modification_times.setdefault(filename, modification_time)
+        return tosca_service_template
+
+    def fork(self, session, forked_importers):
+        """
+        Copies this importer, its children and loaded templates into a session.
+        """
+        importer = forked_importers.get(id(self))
+        if importer is None:
+            importer = copy.copy(self)
+            forked_importers[id(self)] = importer
+            importer.session = session
+            importer.already_loaded_tosca_service_templates = {
+                filename: ToscaServiceTemplate(
+                    filename, tosca_service_template.get_yaml(), importer
+                )
+                for (
+                    filename,
+                    tosca_service_template,
+                ) in self.already_loaded_tosca_service_templates.items()
+            }
+            importer.modification_times = dict(self.modification_times)
+            importer.children_importers = {
+                base_path: child_importer.fork(session, forked_importers)
+                for base_path, child_importer in self.children_importers.items()
+            }
+        return importer
+
+    def prefetch_imports(self, yaml_content):
+        """
+        Prefetches the imports of a YAML content loaded by this importer.
+        """
+        if prefetcher is not None:
+            prefetcher.prefetch_imports(
+                self.session, yaml_content, self.base_path, self.session.alias
+            )
+
     def load_yaml(self, filename):
         """
         Loads a YAML file.
@@ -224,14 +744,23 @@ class FilesystemImporter(Importer):
         """
         Creates a new importer.
         """
-        return FilesystemImporter(self.base_path + path, self.alias)
+        return FilesystemImporter(self.base_path + path, self.alias, self.session)
 
     def load_yaml(self, filename):
         """
         Loads a YAML file.
         """
-        with open(filename, "r") as stream:
-            return yaml.load(stream, Loader=SafeLineLoader)
+        name = filename[len(self.base_path) :]
+        try:
+            stream = open(filename, "rb")
+        except FileNotFoundError:
+            # Record the missing file to detect its creation.
+            self.modification_times[name] = None
+            raise
+        with stream:
+            # Record the modification time to detect later modifications.
+            self.modification_times[name] = os.fstat(stream.fileno()).st_mtime_ns
+            return parse_yaml(stream.read())
 
 
 class UrlImporter(Importer):
@@ -243,27 +772,32 @@ class UrlImporter(Importer):
         """
         Creates a new importer.
         """
-        return UrlImporter(self.base_path + path, self.alias)
+        return UrlImporter(self.base_path + path, self.alias, self.session)
 
     def load_yaml(self, filename):
         """
         Loads a YAML file.
         """
-        try:
-            response = requests.get(filename)
-        except requests.exceptions.ConnectionError:
-            raise FileNotFoundError(filename)
-        if response.status_code == 404:
-            raise FileNotFoundError(filename)
-        return yaml.load(response.text, Loader=SafeLineLoader)
+        if prefetcher is not None:
+            return prefetcher.get(self.session, filename)
+        requests = import_requests()
 
+        return get_url(requests, filename)
 
-class ArchiveImporter(Importer):
+
+class Archive(object):
     """
-    Importer of TOSCA service templates as archive resources.
+    ZIP archive whose entries are indexed once and read on demand.
+
+    Archive files are mapped into memory, so reading an entry only touches
+    its pages, and stored or deflated entries are read without the shared
+    file position of zipfile, which allows threads to decompress and parse
+    entries concurrently. When an archive has at least
+    archive_parallel_entries YAML entries, the imports of its loaded
+    templates are decompressed and parsed by the prefetching threads.
     """
 
-    def __init__(self, zipFile, base_path="", alias={}):
+    def __init__(self, zipFile):
         """
         Constructor.
         """
@@ -271,7 +805,120 @@ class ArchiveImporter(Importer):
             self.zipfile = zipFile
         else:
             self.zipfile = zipfile.ZipFile(zipFile, "r")
-        Importer.__init__(self, base_path, alias)
+        self.mmap = None
+        if self.zipfile.filename is not None:
+            try:
+                with open(self.zipfile.filename, "rb") as stream:
+                    self.mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as exc:
+                LOGGER.debug("%s not mapped: %s" % (self.zipfile.filename, exc))
+        # Index of the archive entries.
+        self.entries = {info.filename: info for info in self.zipfile.infolist()}
+        self.nb_yaml_entries = len(
+            [name for name in self.entries if name.endswith((".yaml", ".yml"))]
+        )
+        # Futures of prefetched but not yet loaded entries.
+        self.futures = {}
+        self.lock = threading.Lock()
+        LOGGER.debug("%r created" % self)
+
+    def __repr__(self):
+        """
+        Textual representation.
+        """
+        return "<Archive filename=%s entries=%d mapped=%s>" % (
+            self.zipfile.filename,
+            len(self.entries),
+            self.mmap is not None,
+        )
+
+    def read(self, name):
+        """
+        Reads the content of an entry, raises KeyError if no such entry.
+        """
+        info = self.entries[name]
+        if (
+            self.mmap is None
+            or info.flag_bits & 0x1  # encrypted
+            or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+        ):
+            return self.zipfile.read(info)
+        offset = info.header_offset
+        if self.mmap[offset : offset + 4] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile("Bad magic number for file header: " + name)
+        filename_length, extra_length = struct.unpack(
+            "<HH", self.mmap[offset + 26 : offset + 30]
+        )
+        offset += zipfile.sizeFileHeader + filename_length + extra_length
+        data = self.mmap[offset : offset + info.compress_size]
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+        if zlib.crc32(data) != info.CRC:
+            raise zipfile.BadZipFile("Bad CRC-32 for file " + name)
+        return data
+
+    def load_yaml(self, name):
+        """
+        Loads a YAML entry, waiting for it if prefetched.
+        """
+        with self.lock:
+            future = self.futures.pop(name, None)
+        if future is not None:
+            try:
+                return future.result()
+            except concurrent.futures.CancelledError:
+                pass
+        return parse_yaml(self.read(name))
+
+    def prefetch(self, name, alias):
+        """
+        Loads a YAML entry and prefetches its imports.
+        """
+        yaml_content = parse_yaml(self.read(name))
+        self.prefetch_imports(yaml_content, name[: name.rfind("/") + 1], alias)
+        return yaml_content
+
+    def prefetch_imports(self, yaml_content, base_path, alias):
+        """
+        Prefetches the imports of a YAML entry loaded from base_path.
+        """
+        if (
+            prefetcher is None
+            or archive_parallel_entries is None
+            or self.nb_yaml_entries < archive_parallel_entries
+        ):
+            return
+        for path in get_import_paths(yaml_content, alias):
+            name = base_path + path
+            if is_url(path) or path.startswith("file:") or name not in self.entries:
+                continue
+            with self.lock:
+                if name in self.futures:
+                    continue
+                try:
+                    self.futures[name] = prefetcher.executor.submit(
+                        self.prefetch, name, alias
+                    )
+                except RuntimeError:
+                    return  # Prefetching was shut down.
+            LOGGER.debug("prefetch %s from %r" % (name, self))
+
+
+class ArchiveImporter(Importer):
+    """
+    Importer of TOSCA service templates as archive resources.
+    """
+
+    def __init__(self, zipFile, base_path="", alias={}, session=None):
+        """
+        Constructor.
+        """
+        if isinstance(zipFile, Archive):
+            self.archive = zipFile
+        else:
+            self.archive = Archive(zipFile)
+        self.zipfile = self.archive.zipfile
+        Importer.__init__(self, base_path, alias, session)
 
     def __repr__(self):
         """
@@ -289,34 +936,177 @@ class ArchiveImporter(Importer):
         """
         Creates a new importer.
         """
-        return ArchiveImporter(self.zipfile, self.base_path + path, self.alias)
+        return ArchiveImporter(
+            self.archive, self.base_path + path, self.alias, self.session
+        )
+
+    def prefetch_imports(self, yaml_content):
+        """
+        Prefetches the imports of a YAML content loaded by this importer.
+        """
+        Importer.prefetch_imports(self, yaml_content)
+        self.archive.prefetch_imports(
+            yaml_content, self.base_path, self.session.alias
+        )
 
     def load_yaml(self, filename):
         """
         Loads a YAML file.
         """
         try:
-            with self.zipfile.open(filename) as stream:
-                return yaml.load(stream, Loader=SafeLineLoader)
+            return self.archive.load_yaml(filename)
         except KeyError:
             raise FileNotFoundError(filename)
 
 
-def imports(tosca_service_template_path, alias={}):
-    # Inits the root loader of TOSCA service templates.
-    importer = FilesystemImporter("", alias)
+class ImportSession(object):
+    """
+    Import state of a TOSCA service template check.
 
-    if not (
-        tosca_service_template_path.endswith(".csar")
-        or tosca_service_template_path.endswith(".zip")
-    ):
-        return importer.imports(tosca_service_template_path)
-    else:
-        importer = ArchiveImporter(tosca_service_template_path, "", alias)
-        tosca_meta = importer.imports("TOSCA-Metadata/TOSCA.meta").get_yaml()
-        if not isinstance(tosca_meta, dict):
-            raise ValueError("Invalid TOSCA-Metadata/TOSCA.meta file")
-        entry_definitions = tosca_meta.get("Entry-Definitions")
-        if entry_definitions is None:
-            raise ValueError("No entry-definitions in TOSCA-Metadata/TOSCA.meta")
-        return importer.imports(entry_definitions)
+    A session owns the root importer, which loads aliased, file: and HTTP
+    templates, the children importers caching loaded templates, and the
+    registry of the templates loaded into the type system. Sessions created
+    by fork() start with the templates already loaded by their parent
+    session, e.g., TOSCA normative types, without sharing further loads.
+    A session can be refreshed to check its template again, e.g., in watch
+    mode, then only modified local files are loaded again.
+    """
+
+    def __init__(self, alias={}, root_importer=None):
+        """
+        Constructor.
+        """
+        self.alias = alias
+        # Registry of the TOSCA service templates loaded into the type system.
+        self.loaded_paths = {}
+        # Type system of the last check of this session.
+        self.type_system = None
+        # Futures of the HTTP imports prefetched for this session, None once
+        # consumed.
+        self.prefetches = {}
+        if root_importer is None:
+            root_importer = FilesystemImporter("", alias, self)
+        self.root_importer = root_importer
+        LOGGER.debug("%r created" % self)
+
+    def __repr__(self):
+        """
+        Textual representation.
+        """
+        return "<ImportSession root_importer=%r>" % self.root_importer
+
+    def fork(self):
+        """
+        Creates a new session starting with the templates loaded by this one.
+        """
+        session = copy.copy(self)
+        session.loaded_paths = {}
+        session.type_system = None
+        session.prefetches = {}
+        with Importer.lock:
+            session.root_importer = self.root_importer.fork(session, {})
+        LOGGER.debug("%r forked from %r" % (session, self))
+        return session
+
+    def get_importers(self):
+        """
+        Returns the root importer and all its children importers.
+        """
+        result = []
+        importers = [self.root_importer]
+        visited = set()
+        while importers:
+            importer = importers.pop()
+            if id(importer) in visited:
+                continue
+            visited.add(id(importer))
+            result.append(importer)
+            importers.extend(importer.children_importers.values())
+        return result
+
+    def get_local_files(self):
+        """
+        Returns the local files loaded by this session as (importer, file name,
+        modification time) tuples.
+        """
+        return [
+            (importer, filename, modification_time)
+            for importer in self.get_importers()
+            for filename, modification_time in importer.modification_times.items()
+        ]
+
+    def get_modified_files(self):
+        """
+        Returns the paths of the local files modified since loaded by this session.
+        """
+        with Importer.lock:
+            return [
+                importer.base_path + filename
+                for importer, filename, modification_time in self.get_local_files()
+                if get_modification_time(importer.base_path + filename)
+                != modification_time
+            ]
+
+    def refresh(self, filepaths=()):
+        """
+        Unloads the templates of the modified local files and of the given
+        ones, and resets the registry to check the template again.
+        """
+        filepaths = {os.path.abspath(filepath) for filepath in filepaths}
+        with Importer.lock:
+            for importer, filename, modification_time in self.get_local_files():
+                filepath = importer.base_path + filename
+                if (
+                    get_modification_time(filepath) != modification_time
+                    or os.path.abspath(filepath) in filepaths
+                ):
+                    LOGGER.debug("unload %s from %r" % (filepath, importer))
+                    del importer.modification_times[filename]
+                    importer.already_loaded_tosca_service_templates.pop(filename, None)
+        self.loaded_paths = {}
+
+    def close(self):
+        """
+        Ends the current check of this session, dropping its prefetched but
+        not consumed imports.
+        """
+        if prefetcher is not None:
+            prefetcher.drop(self)
+
+    def imports(self, tosca_service_template_path):
+        """
+        Imports a TOSCA service template or archive.
+        """
+        if not (
+            tosca_service_template_path.endswith(".csar")
+            or tosca_service_template_path.endswith(".zip")
+        ):
+            return self.root_importer.imports(tosca_service_template_path)
+        else:
+            importer = ArchiveImporter(
+                tosca_service_template_path, "", self.alias, self
+            )
+            tosca_meta = importer.imports("TOSCA-Metadata/TOSCA.meta").get_yaml()
+            if not isinstance(tosca_meta, dict):
+                raise ValueError("Invalid TOSCA-Metadata/TOSCA.meta file")
+            entry_definitions = tosca_meta.get("Entry-Definitions")
+            if entry_definitions is None:
+                raise ValueError("No entry-definitions in TOSCA-Metadata/TOSCA.meta")
+            return importer.imports(entry_definitions)
+
+
+def get_modification_time(filepath):
+    """
+    Returns the modification time of a local file, None if it does not exist.
+    """
+    try:
+        return os.stat(filepath).st_mtime_ns
+    except OSError:
+        return None
+
+
+def imports(tosca_service_template_path, alias={}, session=None):
+    # Inits the import session of TOSCA service templates if not given.
+    if session is None:
+        session = ImportSession(alias)
+    return session.imports(tosca_service_template_path)
@@ -13,17 +13,21 @@
 # Software description: TOSCA to Cloudnet Translator
 ######################################################################
 
+import io
 import logging  # for logging purposes.
 import os
-from sys import stderr
+import sys  # stderr.
 
 import cloudnet.tosca.configuration as configuration
-from cloudnet.tosca.diagnostics import diagnostic
+from cloudnet.tosca.diagnostics import artifact, diagnostic
 from cloudnet.tosca.importers import ArchiveImporter
 from cloudnet.tosca.utils import normalize_name
 from .yaml_line_numbering import Coord as YamlCoord
 
-configuration.DEFAULT_CONFIGURATION["Generator"] = {"filename-format": "shortname"}
+configuration.DEFAULT_CONFIGURATION["Generator"] = {
+    "filename-format": "shortname",
+    "build-manifest": None,  # path of the build manifest, None to always translate.
+}
 configuration.DEFAULT_CONFIGURATION["logging"]["loggers"][__name__] = {
     "level": "WARNING",
 }
@@ -97,7 +101,7 @@ class Processor(object):
             return result
         return False
 
-    def get_import_full_filepath(self, import_yaml):
+    def get_import_full_filepath(self, import_yaml, report=True):
         import cloudnet.tosca.syntax as syntax
 
         import_file = syntax.get_import_file(import_yaml)
@@ -114,10 +118,11 @@ class Processor(object):
             else:
                 repository_url = syntax.get_repository_url(repository)
                 if repository_url is None:
-                    self.error(
-                        ":repositories:" + import_repository + ":url undefined",
-                        repository,
-                    )
+                    if report:
+                        self.error(
+                            ":repositories:" + import_repository + ":url undefined",
+                            repository,
+                        )
                 else:
                     result = repository_url + "/" + import_file
         return result
@@ -144,7 +149,7 @@ class Processor(object):
             "!",
             CEND,
             sep="",
-            file=stderr,
+            file=sys.stderr,
         )
         self.diagnostic("error", message, value=value)
         self.nb_errors += 1
@@ -159,7 +164,7 @@ class Processor(object):
             "!",
             CEND,
             sep="",
-            file=stderr,
+            file=sys.stderr,
         )
         self.diagnostic("warning", message, value=value)
         self.nb_warnings += 1
@@ -172,7 +177,7 @@ class Processor(object):
                 ": ",
                 message,
                 sep="",
-                file=stderr,
+                file=sys.stderr,
             )
         self.diagnostic("info", message, value=value)
 
@@ -193,7 +198,7 @@ class Processor(object):
                 ": ",
                 message,
                 sep="",
-                file=stderr,
+                file=sys.stderr,
             )
 
     def process(self):
@@ -245,7 +250,13 @@ class Generator(Processor):
         generator_title = self.generator_title()
         if generation is True:
             self.info("%s - generation..." % generator_title)
-            self.generation()
+            try:
+                self.generation()
+            except BaseException:
+                # Write what was generated before the failure.
+                if self.file is not None and not self.file.closed:
+                    self.close_file()
+                raise
             self.info("%s - generation done." % generator_title)
         else:
             self.info("%s deactivated!" % generator_title)
@@ -268,7 +279,8 @@ class Generator(Processor):
                 target_directory + "/" + os.path.basename(importer.zipfile.filename)
             )
         if not os.path.exists(target_directory):
-            os.makedirs(target_directory)
+            # Could be concurrently created by another worker process.
+            os.makedirs(target_directory, exist_ok=True)
             self.info(target_directory + "/ created.")
         return target_directory
 
@@ -347,12 +359,26 @@ class Generator(Processor):
                 filepath = target_directory + "/" + filename + extension
             else:
                 filepath = target_directory + "/" + filename
-        # Open the file.
-        self.file = open(filepath, "w")
+        # Open the file, generated in memory until closed.
+        self.filepath = filepath
+        self.file = io.StringIO()
         self.info(filepath + " opened.")
+        artifact(filepath)
 
     def generate(self, *args, sep=" "):
         print(*args, sep=sep, file=self.file)
 
     def close_file(self):
+        content = self.file.getvalue()
         self.file.close()
+        # Only write changed files so that timestamp-based tools skip unchanged ones.
+        try:
+            with open(self.filepath, "r") as stream:
+                unchanged = stream.read() == content
+        except (OSError, UnicodeDecodeError):
+            unchanged = False
+        if unchanged:
+            LOGGER.debug(self.filepath + " unchanged.")
+        else:
+            with open(self.filepath, "w") as stream:
+                stream.write(content)
@@ -0,0 +1,236 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Snapshots of TOSCA normative profiles.
+
+A snapshot stores the parsed types.yaml file of a profile together with the
+types, short names and file extensions it registers into an empty type
+system, so that TypeChecker.check installs the whole profile with one
+deserialization. Snapshots are built next to their profiles by:
+
+python3 profile_snapshots.py [--config-file <config_file.yaml> ...]
+
+A snapshot is ignored when its profile file, the YAML loader or the snapshot
+format changed since it was built.
+"""
+
+import argparse
+import hashlib  # for hashing profile files.
+import logging  # for logging purposes.
+import os
+import pickle  # for storing snapshots.
+import sys
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import yaml
+from cloudnet.tosca.yaml_line_numbering import LOADER_VERSION
+
+configuration.DEFAULT_CONFIGURATION["logging"]["loggers"][__name__] = {
+    "level": "INFO",
+}
+
+# init logger
+LOGGER = logging.getLogger(__name__)
+
+# Version of the snapshot format.
+# Must be increased when snapshots or the type registration change.
+SNAPSHOT_VERSION = 1
+
+# Snapshots already loaded by profile file, with the digest of their profile.
+loaded_snapshots = {}
+
+
+class ProfileSnapshot(object):
+    """
+    Types of a TOSCA profile as registered into an empty type system.
+    """
+
+    def __init__(self, yaml_content, types, short_names, artifact_types_by_file_ext):
+        """
+        Constructor.
+        """
+        self.yaml_content = yaml_content
+        # Registered types by kind, e.g., node_types.
+        self.types = types
+        self.short_names = short_names
+        self.artifact_types_by_file_ext = artifact_types_by_file_ext
+
+    def __repr__(self):
+        """
+        Textual representation.
+        """
+        return "<ProfileSnapshot types=%d>" % sum(
+            len(types) for types in self.types.values()
+        )
+
+
+def get_snapshot_filename(profile_filename):
+    """
+    Returns the snapshot file of a profile file.
+    """
+    return os.path.splitext(profile_filename)[0] + ".snapshot"
+
+
+def get_header(profile_content):
+    """
+    Returns the header identifying the snapshot of a profile content.
+    """
+    return {
+        "version": SNAPSHOT_VERSION,
+        "loader": LOADER_VERSION,
+        "yaml": yaml.__version__,
+        "profile": hashlib.sha256(profile_content).hexdigest(),
+    }
+
+
+def load(profile_filename):
+    """
+    Loads the snapshot of a profile file, returns it with the modification
+    time of the profile file, or None if missing or outdated.
+    """
+    modification_time = importers.get_modification_time(profile_filename)
+    try:
+        with open(profile_filename, "rb") as stream:
+            header = get_header(stream.read())
+    except OSError:
+        return None
+    loaded = loaded_snapshots.get(profile_filename)
+    if loaded is not None and loaded[0] == header:
+        return loaded[1], modification_time
+
+    snapshot_filename = get_snapshot_filename(profile_filename)
+    try:
+        with open(snapshot_filename, "rb") as stream:
+            if pickle.load(stream) != header:
+                LOGGER.warning(
+                    "%s outdated, rebuild it with profile_snapshots.py" % snapshot_filename
+                )
+                return None
+            snapshot = pickle.load(stream)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        LOGGER.warning("%s ignored: %s" % (snapshot_filename, exc))
+        return None
+    LOGGER.debug("%r loaded from %s" % (snapshot, snapshot_filename))
+    loaded_snapshots[profile_filename] = (header, snapshot)
+    return snapshot, modification_time
+
+
+def build(config, profile_path):
+    """
+    Builds the snapshot of a profile, returns the snapshot file.
+    """
+    from cloudnet.tosca.type_system import TypeChecker, TypeSystem
+
+    tosca_service_template = importers.ImportSession().imports(profile_path)
+    importer = tosca_service_template.importer
+    if not isinstance(importer, importers.FilesystemImporter):
+        raise ValueError("%s is not a local file" % profile_path)
+    profile_filename = importer.base_path + tosca_service_template.get_filename()
+    with open(profile_filename, "rb") as stream:
+        header = get_header(stream.read())
+
+    # Register the profile into an empty type system.
+    type_system = TypeSystem(config)
+    type_checker = TypeChecker(tosca_service_template, config, type_system)
+    type_checker.load_tosca_yaml_template(
+        tosca_service_template.get_filename(), tosca_service_template
+    )
+    if (
+        len(type_checker.already_loaded_paths) != 1
+        or type_checker.substituting_topology_templates
+        or type_checker.nb_errors > 0
+        or type_checker.nb_warnings > 0
+    ):
+        raise ValueError(
+            "%s must be a profile without imports, substitutions and diagnostics"
+            % profile_path
+        )
+    default_short_names = config.get("TypeSystem", "short_names")
+    snapshot = ProfileSnapshot(
+        tosca_service_template.get_yaml(),
+        {
+            type_kind: {
+                type_name: type_yaml
+                for type_name, type_yaml in getattr(type_system, type_kind).items()
+                if type_name in type_system.types
+            }
+            for type_kind in [
+                "artifact_types",
+                "data_types",
+                "interface_types",
+                "capability_types",
+                "requirement_types",
+                "relationship_types",
+                "node_types",
+                "group_types",
+                "policy_types",
+            ]
+        },
+        {
+            short_name: type_name
+            for short_name, type_name in type_system.short_names.items()
+            if default_short_names.get(short_name) != type_name
+        },
+        type_system.artifact_types_by_file_ext,
+    )
+
+    snapshot_filename = get_snapshot_filename(profile_filename)
+    # Protocol 4 is readable by all supported Python versions.
+    importers.write_atomically(
+        os.path.dirname(snapshot_filename) or ".",
+        snapshot_filename,
+        pickle.dumps(header, 4) + pickle.dumps(snapshot, 4),
+    )
+    return snapshot_filename
+
+
+def main(argv):
+    from cloudnet.tosca.type_system import TOSCA_NORMATIVE_TYPES, TYPE_SYSTEM
+
+    parser = argparse.ArgumentParser(prog="profile_snapshots")
+    parser.add_argument(
+        "--config-file",
+        metavar="<config_file.yaml>",
+        default=[configuration.CONFIGURATION_FILE],
+        help="use provided YAML file(s) as default configuration",
+        nargs="+",
+    )
+    args = parser.parse_args(argv)
+    config = configuration.load(args.config_file)
+
+    # Build the snapshots of all the configured normative types.
+    profile_paths = []
+    for value in config.get(TYPE_SYSTEM, TOSCA_NORMATIVE_TYPES).values():
+        for profile_path in value if isinstance(value, list) else [value]:
+            if isinstance(profile_path, str) and profile_path not in profile_paths:
+                profile_paths.append(profile_path)
+    return_code = 0
+    for profile_path in profile_paths:
+        try:
+            print("%s built." % build(config, profile_path))
+        except (OSError, ValueError) as exc:
+            print("[ERROR] %s: %s" % (profile_path, exc), file=sys.stderr)
+            return_code = 2
+    return return_code
+
+
+if __name__ == "__main__":
+    # Pickle snapshots as instances of this module, not of __main__.
+    from cloudnet.tosca.profile_snapshots import main
+
+    sys.exit(main(sys.argv[1:]))
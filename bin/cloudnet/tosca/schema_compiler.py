@@ -0,0 +1,348 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Compiler of JSON schemas into Python validity checks.
+
+A JSON schema (draft 4) is compiled into Python functions returning whether an
+instance is valid, with the semantics of jsonschema.Draft4Validator, but
+without building any error. Error messages of invalid instances are given by
+jsonschema.
+
+Only the keywords of the TOSCA schemas are supported, other schemas raise a
+ValueError. Instances reaching non-local or unresolvable references are
+considered invalid, so that jsonschema reports them.
+"""
+
+import re
+import urllib.parse
+from numbers import Number
+
+# Draft 4 keywords not supported, other unknown keywords are ignored by draft 4.
+UNSUPPORTED_KEYWORDS = ["id", "dependencies", "multipleOf", "uniqueItems"]
+
+TYPE_CHECKS = {
+    "array": "isinstance(%s, list)",
+    "boolean": "isinstance(%s, bool)",
+    "integer": "(isinstance(%s, int) and not isinstance(%s, bool))",
+    "null": "%s is None",
+    "number": "(isinstance(%s, Number) and not isinstance(%s, bool))",
+    "object": "isinstance(%s, dict)",
+    "string": "isinstance(%s, str)",
+}
+
+
+def get_type_check(type_name, variable):
+    type_check = TYPE_CHECKS.get(type_name)
+    if type_check is None:
+        raise ValueError("type: %s unsupported" % type_name)
+    return type_check.replace("%s", variable)
+
+
+class SchemaCompiler(object):
+    """
+    Compiler of a JSON schema into the source code of a Python module.
+    """
+
+    def __init__(self, schema, format_checker=None):
+        """
+        Constructor.
+        """
+        self.schema = schema
+        self.format_checker = format_checker
+        self.lines = []
+        self.constants = {"Number": Number, "FORMAT_CHECKER": format_checker}
+        # Names of the functions of already compiled schemas, by schema id.
+        self.function_names = {}
+        # Schemas to compile, i.e., (schema, function name) pairs.
+        self.pending_schemas = []
+
+    def compile(self):
+        """
+        Returns the validity check of the schema.
+        """
+        function_name = self.get_function_name(self.schema)
+        while len(self.pending_schemas) > 0:
+            self.generate_function(*self.pending_schemas.pop(0))
+        namespace = dict(self.constants)
+        exec(compile(self.get_source(), "<compiled schema>", "exec"), namespace)
+        return namespace[function_name]
+
+    def get_source(self):
+        """
+        Returns the generated source code.
+        """
+        return "\n".join(self.lines) + "\n"
+
+    def add_constant(self, kind, value):
+        name = "%s_%d" % (kind, len(self.constants))
+        self.constants[name] = value
+        return name
+
+    def resolve(self, ref):
+        """
+        Returns the schema of a local reference, False if not resolvable.
+        """
+        if not isinstance(ref, str) or not ref.startswith("#"):
+            return False
+        schema = self.schema
+        try:
+            for part in urllib.parse.unquote(ref[1:]).split("/")[1:]:
+                part = part.replace("~1", "/").replace("~0", "~")
+                if isinstance(schema, list):
+                    schema = schema[int(part)]
+                else:
+                    schema = schema[part]
+        except (LookupError, TypeError, ValueError):
+            return False
+        return schema
+
+    def get_function_name(self, schema):
+        """
+        Returns the name of the function checking a schema, None if all
+        instances are valid.
+        """
+        if schema is True or (isinstance(schema, dict) and len(schema) == 0):
+            return None
+        references = []
+        while isinstance(schema, dict) and "$ref" in schema:
+            # Siblings of $ref are ignored by draft 4.
+            references.append(schema)
+            schema = self.resolve(schema["$ref"])
+            if any(schema is reference for reference in references):
+                schema = False  # Cyclic references.
+        if schema is True or (isinstance(schema, dict) and len(schema) == 0):
+            return None
+        function_name = self.function_names.get(id(schema))
+        if function_name is None:
+            function_name = "validate_%d" % len(self.function_names)
+            self.function_names[id(schema)] = function_name
+            self.pending_schemas.append((schema, function_name))
+        return function_name
+
+    def generate_function(self, schema, function_name):
+        """
+        Generates the function checking a schema.
+        """
+        self.lines.append("def %s(x):" % function_name)
+        if schema is False:
+            self.lines.append("    return False")
+        elif isinstance(schema, dict):
+            self.generate_checks(schema)
+            self.lines.append("    return True")
+        else:
+            raise ValueError("%s: schema expected" % schema)
+        self.lines.append("")
+
+    def check(self, indent, condition):
+        self.lines.append("%sif %s:" % (indent, condition))
+        self.lines.append("%s    return False" % indent)
+
+    def generate_checks(self, schema):
+        """
+        Generates the checks of the keywords of a schema.
+        """
+        for keyword in schema:
+            if keyword in UNSUPPORTED_KEYWORDS:
+                raise ValueError("%s unsupported" % keyword)
+
+        # Keywords applying to all instances.
+        types = schema.get("type")
+        if types is not None:
+            if not isinstance(types, list):
+                types = [types]
+            self.check(
+                "    ",
+                "not (%s)"
+                % " or ".join(get_type_check(type_name, "x") for type_name in types),
+            )
+        if "enum" in schema:
+            values = schema["enum"]
+            if not all(isinstance(value, str) for value in values):
+                raise ValueError("enum: only strings supported")
+            name = self.add_constant("ENUM", frozenset(values))
+            self.check("    ", "not (isinstance(x, str) and x in %s)" % name)
+        if "format" in schema and self.format_checker is not None:
+            self.check(
+                "    ",
+                "not FORMAT_CHECKER.conforms(x, %r)" % str(schema["format"]),
+            )
+        for keyword, condition in [
+            ("allOf", "not %s(x)"),
+            ("anyOf", "not (%s)"),
+            ("oneOf", "(%s) != 1"),
+        ]:
+            if keyword not in schema:
+                continue
+            function_names = [
+                self.get_function_name(subschema) for subschema in schema[keyword]
+            ]
+            if keyword == "allOf":
+                for function_name in function_names:
+                    if function_name is not None:
+                        self.check("    ", condition % function_name)
+            elif keyword == "anyOf":
+                if None not in function_names:
+                    self.check(
+                        "    ",
+                        condition
+                        % " or ".join("%s(x)" % name for name in function_names),
+                    )
+            else:
+                self.check(
+                    "    ",
+                    condition
+                    % " + ".join(
+                        "1" if name is None else "bool(%s(x))" % name
+                        for name in function_names
+                    ),
+                )
+        if "not" in schema:
+            function_name = self.get_function_name(schema["not"])
+            self.check("    ", "True" if function_name is None else "%s(x)" % function_name)
+
+        self.generate_object_checks(schema)
+        self.generate_array_checks(schema)
+
+        # Keywords applying to strings.
+        string_checks = []
+        if "pattern" in schema:
+            name = self.add_constant("PATTERN", re.compile(schema["pattern"]).search)
+            string_checks.append("not %s(x)" % name)
+        if "minLength" in schema:
+            string_checks.append("len(x) < %d" % schema["minLength"])
+        if "maxLength" in schema:
+            string_checks.append("len(x) > %d" % schema["maxLength"])
+        self.generate_type_checks("string", string_checks)
+
+        # Keywords applying to numbers.
+        number_checks = []
+        if "minimum" in schema:
+            number_checks.append(
+                "x %s %s"
+                % (
+                    "<=" if schema.get("exclusiveMinimum") else "<",
+                    self.add_constant("MINIMUM", schema["minimum"]),
+                )
+            )
+        if "maximum" in schema:
+            number_checks.append(
+                "x %s %s"
+                % (
+                    ">=" if schema.get("exclusiveMaximum") else ">",
+                    self.add_constant("MAXIMUM", schema["maximum"]),
+                )
+            )
+        self.generate_type_checks("number", number_checks)
+
+    def generate_type_checks(self, type_name, conditions):
+        if len(conditions) > 0:
+            self.lines.append("    if %s:" % get_type_check(type_name, "x"))
+            for condition in conditions:
+                self.check("        ", condition)
+
+    def generate_object_checks(self, schema):
+        """
+        Generates the checks of the keywords applying to objects.
+        """
+        lines = len(self.lines)
+        self.lines.append("    if isinstance(x, dict):")
+        for property_name in schema.get("required", []):
+            self.check("        ", "%r not in x" % str(property_name))
+        if "minProperties" in schema:
+            self.check("        ", "len(x) < %d" % schema["minProperties"])
+        if "maxProperties" in schema:
+            self.check("        ", "len(x) > %d" % schema["maxProperties"])
+        properties = schema.get("properties", {})
+        for property_name, subschema in properties.items():
+            function_name = self.get_function_name(subschema)
+            if function_name is not None:
+                self.lines.append("        if %r in x:" % str(property_name))
+                self.check(
+                    "            ", "not %s(x[%r])" % (function_name, str(property_name))
+                )
+        pattern_properties = schema.get("patternProperties", {})
+        for pattern, subschema in pattern_properties.items():
+            function_name = self.get_function_name(subschema)
+            if function_name is not None:
+                name = self.add_constant("PATTERN", re.compile(pattern).search)
+                self.lines.append("        for k, v in x.items():")
+                self.check(
+                    "            ",
+                    "not isinstance(k, str) or (%s(k) and not %s(v))"
+                    % (name, function_name),
+                )
+        additional_properties = schema.get("additionalProperties", True)
+        if additional_properties is False or isinstance(additional_properties, dict):
+            function_name = self.get_function_name(additional_properties)
+            if function_name is not None or additional_properties is False:
+                name = self.add_constant("PROPERTIES", frozenset(properties))
+                self.lines.append("        for k in x:")
+                condition = "k not in %s" % name
+                if len(pattern_properties) > 0:
+                    pattern = self.add_constant(
+                        "PATTERN", re.compile("|".join(pattern_properties)).search
+                    )
+                    condition += " and (not isinstance(k, str) or not %s(k))" % pattern
+                if function_name is None:
+                    self.check("            ", condition)
+                else:
+                    self.check(
+                        "            ", "%s and not %s(x[k])" % (condition, function_name)
+                    )
+        if len(self.lines) == lines + 1:
+            del self.lines[lines:]
+
+    def generate_array_checks(self, schema):
+        """
+        Generates the checks of the keywords applying to arrays.
+        """
+        lines = len(self.lines)
+        self.lines.append("    if isinstance(x, list):")
+        if "minItems" in schema:
+            self.check("        ", "len(x) < %d" % schema["minItems"])
+        if "maxItems" in schema:
+            self.check("        ", "len(x) > %d" % schema["maxItems"])
+        items = schema.get("items", {})
+        if isinstance(items, dict):
+            function_name = self.get_function_name(items)
+            if function_name is not None:
+                self.lines.append("        for v in x:")
+                self.check("            ", "not %s(v)" % function_name)
+        else:
+            for index, subschema in enumerate(items):
+                function_name = self.get_function_name(subschema)
+                if function_name is not None:
+                    self.check(
+                        "        ",
+                        "len(x) > %d and not %s(x[%d])" % (index, function_name, index),
+                    )
+            additional_items = schema.get("additionalItems", True)
+            if additional_items is False:
+                self.check("        ", "len(x) > %d" % len(items))
+            elif isinstance(additional_items, dict):
+                function_name = self.get_function_name(additional_items)
+                if function_name is not None:
+                    self.lines.append("        for v in x[%d:]:" % len(items))
+                    self.check("            ", "not %s(v)" % function_name)
+        if len(self.lines) == lines + 1:
+            del self.lines[lines:]
+
+
+def compile_schema(schema, format_checker=None):
+    """
+    Returns a function returning whether an instance is valid against a JSON
+    schema, raises a ValueError if the schema is unsupported.
+    """
+    return SchemaCompiler(schema, format_checker).compile()
@@ -0,0 +1,213 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Resident translation server of TOSCA to Cloudnet Translator.
+
+The server keeps the configuration, the TOSCA normative profiles and the
+TOSCA schemas loaded, and translates templates on requests received on a
+localhost TCP port or a Unix socket, e.g.,
+
+curl --unix-socket /tmp/tosca2cloudnet.sock http://localhost/translate \\
+     -H "Content-Type: application/json" \\
+     -d '{"template_file": "/path/to/template.yaml", "generate": false}'
+
+TCP ports are only listened on loopback addresses, as requests are not
+authenticated. A request is a JSON object, sent with the application/json
+content type, with the following keys:
+- template_file: path of the template to translate, relative to the
+  working directory of the server,
+- generate: false to only check the template, true by default.
+
+The answer is a JSON object with the following keys:
+- template_file: path of the translated template,
+- return_code: exit status of the translation,
+- diagnostics: diagnostic records of the translation,
+- artifacts: absolute paths of the generated artifacts,
+- stdout and stderr: console outputs of the translation.
+
+Requests are translated one at a time.
+"""
+
+import http.server
+import ipaddress
+import json
+import logging  # for logging purposes.
+import os
+import signal
+import socketserver
+import stat
+import time
+
+import cloudnet.tosca.configuration as configuration
+
+configuration.DEFAULT_CONFIGURATION["logging"]["loggers"][__name__] = {
+    "level": "INFO",
+}
+
+# init logger
+LOGGER = logging.getLogger(__name__)
+
+TRANSLATE_PATH = "/translate"
+
+
+class TranslationRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Handler of translation requests.
+    """
+
+    def do_POST(self):
+        if self.path != TRANSLATE_PATH:
+            self.send_answer(404, {"error": "unknown path " + self.path})
+            return
+        # Simple requests of web pages can not have this content type.
+        if self.headers.get_content_type() != "application/json":
+            self.send_answer(415, {"error": "application/json content type expected"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("JSON object expected")
+            template_file = request["template_file"]
+            generate = request.get("generate", True)
+            if not isinstance(template_file, str) or not isinstance(generate, bool):
+                raise ValueError("template_file must be a string, generate a boolean")
+        except (KeyError, ValueError) as exc:
+            self.send_answer(400, {"error": "invalid request: %s" % exc})
+            return
+
+        start = time.perf_counter()
+        return_code, stdout, stderr, diagnostic_lines, artifacts = self.server.translate(
+            template_file, generate
+        )
+        LOGGER.info(
+            "%s translated in %.3f s with exit status %d."
+            % (template_file, time.perf_counter() - start, return_code)
+        )
+        self.send_answer(
+            200,
+            {
+                "template_file": template_file,
+                "return_code": return_code,
+                "diagnostics": [
+                    json.loads(line) for line in diagnostic_lines.splitlines() if line
+                ],
+                "artifacts": [os.path.abspath(filepath) for filepath in artifacts],
+                "stdout": stdout,
+                "stderr": stderr,
+            },
+        )
+
+    def send_answer(self, status, answer):
+        content = json.dumps(answer).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def address_string(self):
+        # Clients of Unix sockets have no address.
+        return str(self.client_address[0]) if self.client_address else "local"
+
+    def log_message(self, format, *args):
+        LOGGER.debug("%s - %s" % (self.address_string(), format % args))
+
+
+class TranslationServer(http.server.HTTPServer):
+    """
+    Translation server on a TCP port.
+    """
+
+    def __init__(self, address, translate):
+        """
+        Constructor.
+        """
+        self.translate = translate
+        http.server.HTTPServer.__init__(self, address, TranslationRequestHandler)
+
+
+class UnixTranslationServer(socketserver.UnixStreamServer):
+    """
+    Translation server on a Unix socket.
+    """
+
+    def __init__(self, path, translate):
+        """
+        Constructor.
+        """
+        self.translate = translate
+        try:
+            mode = os.stat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError("%s exists and is not a socket" % path)
+            os.remove(path)  # left by a previous server.
+        socketserver.UnixStreamServer.__init__(self, path, TranslationRequestHandler)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        os.remove(self.server_address)
+
+
+def create_server(address, translate):
+    """
+    Create a translation server listening to [<host>:]<port> or a Unix socket path.
+    translate(template_file, generate) must return the exit status, console
+    outputs, diagnostic lines and generated artifacts of the translation.
+    """
+    if address.startswith("unix:"):
+        return UnixTranslationServer(address[len("unix:") :], translate)
+    if "/" in address:
+        return UnixTranslationServer(address, translate)
+    host, _, port = address.rpartition(":")
+    host = host or "127.0.0.1"
+    try:
+        loopback = host == "localhost" or ipaddress.IPv4Address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError("%s is not a loopback IPv4 address or localhost" % host)
+    if not port.isdigit():
+        raise ValueError("invalid port %s" % port)
+    return TranslationServer((host, int(port)), translate)
+
+
+def interrupt(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def serve(address, translate):
+    """
+    Serve translation requests until interrupted or terminated, return the
+    exit status.
+    """
+    try:
+        server = create_server(address, translate)
+    except (OSError, ValueError) as exc:
+        LOGGER.error("Translation server not started on %s: %s" % (address, exc))
+        return 1
+    signal.signal(signal.SIGTERM, interrupt)
+    LOGGER.info("Translation server listening on %s." % address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    LOGGER.info("Translation server stopped.")
+    return 0
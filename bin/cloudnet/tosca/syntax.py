@@ -17,6 +17,7 @@ import logging  # for logging purposes.
 import os
 
 import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.schema_compiler as schema_compiler
 from cloudnet.tosca.processors import Checker
 from cloudnet.tosca.utils import normalize_dict
 from cloudnet.tosca.yaml_line_numbering import DictCoord
@@ -554,6 +555,42 @@ def get_operations(definition):
     return {OPERATIONS: operations}
 
 
+# Validators already built by schema file, shared by all checked templates.
+validators = {}
+
+
+def get_validator(schema_file, tosca_schema):
+    """
+    Returns the validator of a TOSCA schema and its compiled validity check,
+    None if the schema can not be compiled. They are built once per schema
+    file and again only if the schema is loaded again, e.g., when modified.
+    """
+    cached = validators.get(schema_file)
+    if cached is not None and cached[0] is tosca_schema:
+        return cached[1:]
+
+    import jsonschema
+
+    #        jsonschema.validate(
+    #            instance=template_yaml,
+    #            schema=tosca_schema,
+    #            format_checker=jsonschema.draft4_format_checker) # TODO use draft7_format_checker
+
+    validator = jsonschema.Draft4Validator(
+        tosca_schema, format_checker=jsonschema.draft7_format_checker
+    )
+    try:
+        is_valid = schema_compiler.compile_schema(
+            tosca_schema, validator.format_checker
+        )
+    except Exception as exc:
+        LOGGER.debug("%s not compiled: %s" % (schema_file, exc))
+        is_valid = None
+    validators[schema_file] = (tosca_schema, validator, is_valid)
+    LOGGER.debug("validator of %s built" % schema_file)
+    return validator, is_valid
+
+
 class SyntaxChecker(Checker):
     """
     TOSCA syntax checker
@@ -620,16 +657,10 @@ class SyntaxChecker(Checker):
 
         is_validated = True
 
-        import jsonschema
-
-        #        jsonschema.validate(
-        #            instance=template_yaml,
-        #            schema=tosca_schema,
-        #            format_checker=jsonschema.draft4_format_checker) # TODO use draft7_format_checker
-
-        validator = jsonschema.Draft4Validator(
-            tosca_schema, format_checker=jsonschema.draft7_format_checker
-        )
+        validator, is_valid = get_validator(schema_file, tosca_schema)
+        # Only invalid templates are validated again to report their errors.
+        if is_valid is not None and is_valid(template_yaml):
+            return is_validated
         errors = validator.iter_errors(template_yaml)
 
         # Log all errors.
@@ -20,29 +20,50 @@ It can be used as,
 - python3 tosca2cloudnet.py --template-file=<path to the YAML template>
 - python3 tosca2cloudnet.py --template-file=<path to the CSAR zip file>
 - python3 tosca2cloudnet.py --template-file=<URL to the template or CSAR>
+- python3 tosca2cloudnet.py --template-file <path1> <path2> ... (batch mode)
+- python3 tosca2cloudnet.py --template-file=<directory or glob pattern> (batch mode)
+- python3 tosca2cloudnet.py --jobs=<N> --template-file <path1> <path2> ... (parallel batch mode)
+- python3 tosca2cloudnet.py --server=<[host:]port or Unix socket path> (server mode)
+- python3 tosca2cloudnet.py --watch --template-file=<path> (watch mode)
 
 e.g.
 python3 tosca2cloudnet.py --template-file=etsi_nfv_sol001_vnfd_0_8_types.yaml
 
 python3 tosca2cloudnet.py --template-file=sunshine.vnfd.tosca.yaml
+
+python3 tosca2cloudnet.py --template-file 'examples/**/*.yaml'
+
+In batch mode, the configuration and the TOSCA normative profiles are loaded
+only once, each template is checked with its own type system and the exit status
+is the worst exit status of all the templates.
+With --jobs, templates are translated by a pool of worker processes and their
+console outputs and diagnostics are emitted in the order of the templates.
+In server mode, templates are translated on requests, see server.py.
+In watch mode, the template is translated again each time it or one of its
+imported local files is modified, and only modified files are loaded again.
 """
 
 import argparse
+import contextlib
+import glob
+import io
+import logging
+import multiprocessing
 import os
+import signal
 import sys  # argv and stderr.
+import time
 
+import cloudnet.tosca.build_manifest as build_manifest
 import cloudnet.tosca.configuration as configuration
 import cloudnet.tosca.diagnostics as diagnostics
 import cloudnet.tosca.importers as importers
 import cloudnet.tosca.processors as processors
-from cloudnet.tosca.alloy import AlloyGenerator
-from cloudnet.tosca.hot import HOTGenerator
-from cloudnet.tosca.declarative_workflows import DeclarativeWorkflowGenerator
-from cloudnet.tosca.network_diagrams import NwdiagGenerator
+import cloudnet.tosca.syntax as syntax
+import cloudnet.tosca.type_system as type_system
+from cloudnet.tosca.processors import Generator
 from cloudnet.tosca.syntax import SyntaxChecker
-from cloudnet.tosca.tosca_diagrams import ToscaDiagramGenerator
 from cloudnet.tosca.type_system import TypeChecker, TypeSystem
-from cloudnet.tosca.uml2_diagrams import PlantUMLGenerator
 from cloudnet.tosca.yaml_line_numbering import Coord
 
 ALIASED_TOSCA_SERVICE_TEMPLATES = "aliased_tosca_service_templates"
@@ -63,44 +84,109 @@ configuration.DEFAULT_CONFIGURATION[ALIASED_TOSCA_SERVICE_TEMPLATES] = {
 }
 
 
-def main(argv):
-    try:
-        # Parse arguments.
-        parser = argparse.ArgumentParser(prog="tosca2cloudnet")
-        parser.add_argument(
-            "--template-file",
-            metavar="<filename>",
-            required=True,
-            help="YAML template or CSAR file to parse.",
-        )
-        parser.add_argument(
-            "--diagnostics-file",
-            metavar="<filename>",
-            default="",
-            help="json log output processing file.",
-        )
+# Generators of declarative workflows, Alloy specifications, UML2, network,
+# TOSCA diagrams and Heat templates as (configuration key, title, module,
+# class), imported only when their generation is not deactivated.
+GENERATORS = [
+    (
+        "DeclarativeWorkflows",
+        "TOSCA Declarative Workflow Generator",
+        "cloudnet.tosca.declarative_workflows",
+        "DeclarativeWorkflowGenerator",
+    ),
+    ("Alloy", "Alloy Generator", "cloudnet.tosca.alloy", "AlloyGenerator"),
+    (
+        "UML2",
+        "UML2 Diagram Generator",
+        "cloudnet.tosca.uml2_diagrams",
+        "PlantUMLGenerator",
+    ),
+    (
+        "nwdiag",
+        "Network Diagram Generator",
+        "cloudnet.tosca.network_diagrams",
+        "NwdiagGenerator",
+    ),
+    (
+        "tosca_diagrams",
+        "TOSCA Diagram Generator",
+        "cloudnet.tosca.tosca_diagrams",
+        "ToscaDiagramGenerator",
+    ),
+    ("HOT", "HOT Generator", "cloudnet.tosca.hot", "HOTGenerator"),
+]
 
-        parser.add_argument(
-            "--config-file",
-            metavar="<config_file.yaml>",
-            default=[configuration.CONFIGURATION_FILE],
-            help="use provided YAML file(s) as default configuration",
-            nargs="+",
-        )
-        (args, extra_args) = parser.parse_known_args(argv)
+TEMPLATE_FILE_EXTENSIONS = (".yaml", ".yml")
+ARCHIVE_FILE_EXTENSIONS = (".csar", ".zip")
 
-        diagnostics.configure(
-            template_filename=args.template_file, log_filename=args.diagnostics_file
-        )
 
-        # Load configuration.
-        config = configuration.load(args.config_file)
+def is_tosca_template_file(path):
+    """
+    Is the given file a TOSCA service template or archive?
+    """
+    if path.endswith(ARCHIVE_FILE_EXTENSIONS):
+        return True
+    if path.endswith(TEMPLATE_FILE_EXTENSIONS):
+        try:
+            with open(path, "r") as stream:
+                for line in stream:
+                    if line.startswith("tosca_definitions_version:"):
+                        return True
+        except (OSError, UnicodeDecodeError):
+            pass
+    return False
+
 
+def expand_template_files(paths):
+    """
+    Expand directories and glob patterns into TOSCA template files.
+    """
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            # Search TOSCA service templates and archives into the directory.
+            nb_template_files = len(result)
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for filename in sorted(filenames):
+                    filepath = os.path.join(dirpath, filename)
+                    if is_tosca_template_file(filepath):
+                        result.append(filepath)
+            if len(result) == nb_template_files:
+                result.append(path)  # an error will be reported for this path.
+        elif (
+            not os.path.exists(path)
+            and not path.startswith(("http:", "https:"))
+            and any(character in path for character in "*?[")
+        ):
+            filepaths = sorted(glob.glob(path, recursive=True))
+            if len(filepaths) == 0:
+                result.append(path)  # an error will be reported for this path.
+            for filepath in filepaths:
+                if os.path.isdir(filepath):
+                    result.extend(expand_template_files([filepath]))
+                else:
+                    result.append(filepath)
+        else:
+            result.append(path)
+    return result
+
+
+def translate(template_file, config, import_session=None, generate=True):
+    """
+    Check and translate one TOSCA template, return its exit status.
+    The template is imported into import_session if given.
+    Only checks are done when generate is False.
+    """
+    if import_session is None:
+        import_session = importers.ImportSession(
+            config.get(ALIASED_TOSCA_SERVICE_TEMPLATES)
+        )
+    diagnostics.reset(template_file)
+    try:
         # Load the TOSCA service template.
         try:
-            tosca_service_template = importers.imports(
-                args.template_file, config.get(ALIASED_TOSCA_SERVICE_TEMPLATES)
-            )
+            tosca_service_template = import_session.imports(template_file)
         except Exception as e:
             location = ""
             if len(e.args) != 0:
@@ -110,7 +196,7 @@ def main(argv):
             print(
                 processors.CRED,
                 "[ERROR] ",
-                args.template_file,
+                template_file,
                 location,
                 ": ",
                 e,
@@ -124,7 +210,7 @@ def main(argv):
                 value = ""
             diagnostics.diagnostic(
                 gravity="error",
-                file=args.template_file,
+                file=template_file,
                 message=str(e),
                 cls="tosca2cloudnet",
                 value=value,
@@ -140,30 +226,33 @@ def main(argv):
         nb_errors += syntax_checker.nb_errors
         nb_warnings += syntax_checker.nb_warnings
 
-        # Create a TOSCA type system.
-        type_system = TypeSystem(config)
+        # Create a TOSCA type system, reusing the merged types of the previous
+        # check of the import session if any.
+        type_system = TypeSystem(config, import_session.type_system)
+        import_session.type_system = type_system
 
         # Type checking.
         type_checker = TypeChecker(tosca_service_template, config, type_system)
         if type_checker.check() == False:  # or type_checker.nb_errors > 0:
-            exit(1)
+            return 1
         nb_errors += type_checker.nb_errors
         nb_warnings += type_checker.nb_warnings
+        if not generate:
+            type_system.log_statistics()
+            return diagnostics.return_code
 
         # Generate Alloy specifications, UML2, network, TOSCA diagrams and Heat templates.
         type_checker.file = None
-        for generator_class in [
-            DeclarativeWorkflowGenerator,
-            AlloyGenerator,
-            PlantUMLGenerator,
-            NwdiagGenerator,
-            ToscaDiagramGenerator,
-            HOTGenerator,
-        ]:
+        for key, title, module_name, class_name in GENERATORS:
+            if is_generation_deactivated(config, key):
+                type_checker.info("%s deactivated!" % title)
+                continue
+            generator_class = getattr(config.import_module(module_name), class_name)
             generator = generator_class(generator=type_checker)
             generator.process()
             nb_errors += generator.nb_errors
             nb_warnings += generator.nb_warnings
+        type_system.log_statistics()
         return diagnostics.return_code
     except Exception as exception:
         print(processors.CRED, file=sys.stderr)
@@ -178,6 +267,394 @@ def main(argv):
             cls="main",
         )
         return 2
+    finally:
+        import_session.close()
+
+
+def is_generation_deactivated(config, key):
+    """
+    Is a generation explicitly deactivated by the configuration?
+    """
+    try:
+        return config.get(key, Generator.GENERATION) is not True
+    except (KeyError, TypeError):
+        return False  # Default given by the generator once imported.
+
+
+def preload_tosca_profiles(config):
+    """
+    Load TOSCA normative types and schemas into a new import session.
+    """
+    session = importers.ImportSession(config.get(ALIASED_TOSCA_SERVICE_TEMPLATES))
+    paths = []
+    for mappings in [
+        config.get(type_system.TYPE_SYSTEM, type_system.TOSCA_NORMATIVE_TYPES),
+        config.get(syntax.SYNTAX, syntax.TOSCA_DEFINITIONS_VERSION),
+    ]:
+        for value in mappings.values():
+            for path in value if isinstance(value, list) else [value]:
+                # Ignore mappings to other keys.
+                if isinstance(path, str) and path not in mappings:
+                    paths.append(path)
+    for path in paths:
+        try:
+            session.imports(path)
+        except (FileNotFoundError, ValueError):
+            pass  # Errors will be reported when the template is translated.
+    return session
+
+
+# Configuration of the current worker process.
+worker_configuration = None
+worker_diagnostics = False
+worker_profiles_session = None
+
+
+def initialize_worker(config_files, diagnostics_file):
+    """
+    Warm start a worker process translating templates.
+    """
+    global worker_configuration, worker_diagnostics, worker_profiles_session
+    worker_configuration = configuration.load(config_files)
+    importers.configure(worker_configuration)
+    worker_diagnostics = diagnostics_file != ""
+    worker_profiles_session = preload_tosca_profiles(worker_configuration)
+
+
+def translate_captured(
+    template_file, config, import_session, generate=True, capture_diagnostics=True
+):
+    """
+    Translate a template, return its exit status, console outputs,
+    diagnostics and generated artifacts.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    outfile = diagnostics.outfile
+    # Without diagnostics, the exit status ignores warnings as in other modes.
+    diagnostics.outfile = io.StringIO() if capture_diagnostics else None
+    diagnostics.artifacts = []
+    # Logging handlers configured on the standard output write to the captured one.
+    handlers = [
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, logging.StreamHandler)
+        and handler.stream is sys.stdout
+    ]
+    for handler in handlers:
+        handler.setStream(stdout)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            return_code = translate(template_file, config, import_session, generate)
+    finally:
+        for handler in handlers:
+            handler.setStream(sys.stdout)
+        diagnostic_lines = (
+            diagnostics.outfile.getvalue() if capture_diagnostics else ""
+        )
+        artifacts = diagnostics.artifacts
+        diagnostics.outfile = outfile
+        diagnostics.artifacts = None
+    return (
+        return_code,
+        stdout.getvalue(),
+        stderr.getvalue(),
+        diagnostic_lines,
+        artifacts,
+    )
+
+
+def emit_outputs(outputs):
+    """
+    Emit the console outputs and diagnostics of a captured translation.
+    """
+    return_code, stdout, stderr, diagnostic_lines = outputs[:4]
+    sys.stdout.write(stdout)
+    sys.stdout.flush()
+    sys.stderr.write(stderr)
+    sys.stderr.flush()
+    if diagnostics.outfile is not None:
+        diagnostics.outfile.write(diagnostic_lines)
+        diagnostics.outfile.flush()
+
+
+def translate_incrementally(template_file, config, import_session, manifest):
+    """
+    Translate a template unless unchanged since its translation recorded in
+    the build manifest, emit its outputs and return its exit status.
+    """
+    outputs = manifest.get_outputs(template_file)
+    if outputs is not None:
+        print("%s unchanged since its last translation." % template_file)
+    else:
+        outputs = translate_captured(
+            template_file,
+            config,
+            import_session,
+            capture_diagnostics=diagnostics.outfile is not None,
+        )
+        manifest.record(
+            template_file,
+            build_manifest.get_template_files(template_file, import_session),
+            outputs,
+        )
+    emit_outputs(outputs)
+    return outputs[0]
+
+
+def translate_in_worker(template_file):
+    """
+    Translate a template in a worker process, return its exit status,
+    console outputs, diagnostics, generated artifacts, and the digests of its
+    files if a build manifest is configured.
+    """
+    import_session = worker_profiles_session.fork()
+    outputs = translate_captured(
+        template_file,
+        worker_configuration,
+        import_session,
+        capture_diagnostics=worker_diagnostics,
+    )
+    files = None
+    if worker_configuration.get("Generator", "build-manifest"):
+        files = build_manifest.get_template_files(template_file, import_session)
+    return outputs, files
+
+
+def translate_in_parallel(
+    template_files, jobs, config_files, diagnostics_file, manifest=None
+):
+    """
+    Translate templates with a pool of worker processes, return their exit status.
+    Templates unchanged since recorded in the build manifest are not translated.
+    """
+    unchanged_outputs = {}
+    if manifest is not None:
+        for template_file in template_files:
+            outputs = manifest.get_outputs(template_file)
+            if outputs is not None:
+                unchanged_outputs[template_file] = outputs
+    changed_template_files = [
+        template_file
+        for template_file in template_files
+        if template_file not in unchanged_outputs
+    ]
+    return_codes = []
+    with multiprocessing.Pool(
+        processes=max(1, min(jobs, len(changed_template_files))),
+        initializer=initialize_worker,
+        initargs=(config_files, diagnostics_file),
+    ) as pool:
+        results = pool.imap(translate_in_worker, changed_template_files)
+        # Outputs are emitted in the order of the templates.
+        for template_file in template_files:
+            print("Translate %s..." % template_file)
+            outputs = unchanged_outputs.get(template_file)
+            if outputs is not None:
+                print("%s unchanged since its last translation." % template_file)
+            else:
+                outputs, files = next(results)
+                if manifest is not None:
+                    manifest.record(template_file, files, outputs)
+            emit_outputs(outputs)
+            return_codes.append(outputs[0])
+    return return_codes
+
+
+def watch(template_file, config, import_session, interval):
+    """
+    Translate a template, then translate it again each time it or one of its
+    imported local files is modified, until interrupted. Return the last exit
+    status.
+    """
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        while True:
+            start = time.perf_counter()
+            return_code = translate(template_file, config, import_session)
+            print(
+                "%s translated in %.3f s with exit status %d, watching modifications..."
+                % (template_file, time.perf_counter() - start, return_code)
+            )
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if diagnostics.outfile is not None:
+                diagnostics.outfile.flush()
+            # The template is watched itself as it may have failed to load.
+            modification_time = importers.get_modification_time(template_file)
+            while True:
+                time.sleep(interval)
+                modified_files = import_session.get_modified_files()
+                if (
+                    importers.get_modification_time(template_file) != modification_time
+                    and template_file not in modified_files
+                ):
+                    modified_files.append(template_file)
+                if modified_files:
+                    break
+            print(
+                "Translate %s again as %s modified..."
+                % (template_file, ", ".join(modified_files))
+            )
+            # The template is always loaded again as its YAML content is
+            # updated by type checking.
+            import_session.refresh([template_file])
+    except KeyboardInterrupt:
+        return return_code
+
+
+def main(argv):
+    try:
+        # Parse arguments.
+        parser = argparse.ArgumentParser(prog="tosca2cloudnet")
+        parser.add_argument(
+            "--template-file",
+            metavar="<filename>",
+            help="YAML template(s), CSAR file(s), directories or glob patterns to parse.",
+            nargs="+",
+        )
+        parser.add_argument(
+            "--diagnostics-file",
+            metavar="<filename>",
+            default="",
+            help="json log output processing file.",
+        )
+
+        parser.add_argument(
+            "--config-file",
+            metavar="<config_file.yaml>",
+            default=[configuration.CONFIGURATION_FILE],
+            help="use provided YAML file(s) as default configuration",
+            nargs="+",
+        )
+        parser.add_argument(
+            "--jobs",
+            metavar="<N>",
+            type=int,
+            default=1,
+            help="number of templates translated in parallel (0 for the number of CPUs).",
+        )
+        parser.add_argument(
+            "--server",
+            metavar="<[host:]port or socket path>",
+            help="serve translation requests on a localhost port or a Unix socket.",
+        )
+        parser.add_argument(
+            "--watch",
+            metavar="<seconds>",
+            type=float,
+            nargs="?",
+            const=1.0,
+            help="translate the template again when it or its imported local files are modified, checked every <seconds> (1 by default).",
+        )
+        (args, extra_args) = parser.parse_known_args(argv)
+
+        # Server mode.
+        if args.server is not None:
+            import cloudnet.tosca.server as server
+
+            config = configuration.load(args.config_file)
+            importers.configure(config)
+            profiles_session = preload_tosca_profiles(config)
+            return server.serve(
+                args.server,
+                lambda template_file, generate: translate_captured(
+                    template_file, config, profiles_session.fork(), generate
+                ),
+            )
+
+        if args.template_file is None:
+            parser.error("the following arguments are required: --template-file")
+        template_files = expand_template_files(args.template_file)
+
+        diagnostics.configure(
+            template_filename=template_files[0], log_filename=args.diagnostics_file
+        )
+
+        # Load configuration once for all the templates.
+        config = configuration.load(args.config_file)
+        importers.configure(config)
+
+        # Load the build manifest of incremental translations if configured.
+        manifest = None
+        manifest_file = config.get("Generator", "build-manifest")
+        if manifest_file and args.watch is None:
+            manifest = build_manifest.BuildManifest(
+                manifest_file, config, diagnostics.outfile is not None
+            )
+
+        # Watch mode.
+        if args.watch is not None:
+            if len(template_files) != 1:
+                parser.error("--watch requires one template file")
+            return watch(
+                template_files[0],
+                config,
+                importers.ImportSession(config.get(ALIASED_TOSCA_SERVICE_TEMPLATES)),
+                args.watch,
+            )
+
+        # Single template mode.
+        if len(template_files) == 1:
+            if manifest is None:
+                return translate(template_files[0], config)
+            return_code = translate_incrementally(
+                template_files[0],
+                config,
+                importers.ImportSession(config.get(ALIASED_TOSCA_SERVICE_TEMPLATES)),
+                manifest,
+            )
+            manifest.save()
+            return return_code
+
+        # Batch mode.
+        jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+        if jobs > 1:
+            return_codes = translate_in_parallel(
+                template_files, jobs, args.config_file, args.diagnostics_file, manifest
+            )
+        else:
+            return_codes = []
+            profiles_session = preload_tosca_profiles(config)
+            for template_file in template_files:
+                print("Translate %s..." % template_file)
+                sys.stdout.flush()
+                if manifest is None:
+                    return_code = translate(
+                        template_file, config, profiles_session.fork()
+                    )
+                else:
+                    return_code = translate_incrementally(
+                        template_file, config, profiles_session.fork(), manifest
+                    )
+                return_codes.append(return_code)
+                sys.stderr.flush()
+        print(
+            "%d templates translated: %d succeeded, %d with warnings, %d failed."
+            % (
+                len(template_files),
+                return_codes.count(0),
+                return_codes.count(1),
+                len([code for code in return_codes if code > 1]),
+            )
+        )
+        if manifest is not None:
+            manifest.save()
+        # Aggregated exit status is the worst one.
+        return max(return_codes)
+    except Exception as exception:
+        print(processors.CRED, file=sys.stderr)
+        import traceback
+
+        traceback.print_exc(file=sys.stderr)
+        print(processors.CEND, file=sys.stderr)
+        diagnostics.diagnostic(
+            gravity="error",
+            message=f"global exception {type(exception).__name__}, see output log.",
+            file="",
+            cls="main",
+        )
+        return 2
 
 
 if __name__ == "__main__":
@@ -13,17 +13,20 @@
 # Software description: TOSCA to Cloudnet Translator
 ######################################################################
 
+import collections
+import concurrent.futures  # for parsing imports in parallel.
 import datetime
 import logging  # for logging purposes.
 import os
 import re
-from copy import deepcopy
 
 import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import cloudnet.tosca.profile_snapshots as profile_snapshots
 import cloudnet.tosca.syntax as syntax
 from cloudnet.tosca.diagnostics import diagnostic
 from cloudnet.tosca.processors import CEND, CRED, Checker
-from cloudnet.tosca.utils import merge_dict, normalize_dict
+from cloudnet.tosca.utils import copy_yaml, merge_dict, normalize_dict
 from cloudnet.tosca.yaml_line_numbering import Coord as YamlCoord
 
 profiles_directory = "file:" + os.path.dirname(__file__) + "/profiles"
@@ -33,8 +36,17 @@ SERVICE_TEMPLATE_CATALOG = "Service-Template-Catalog"
 TOSCA_NORMATIVE_TYPES = "tosca_normative_types"
 DEFAULT_TOSCA_NORMATIVE_TYPES = "default_tosca_normative_types"
 SHORT_NAMES = "short_names"
+IMPORT_WORKERS = "import_workers"
+LOG_STATISTICS = "log_statistics"
 configuration.DEFAULT_CONFIGURATION[TYPE_SYSTEM] = {
     SERVICE_TEMPLATE_CATALOG: None,
+    # Number of threads parsing imported templates, 1 to parse them on demand.
+    # Parsing local files in parallel gains little as YAML construction holds
+    # the GIL, more threads only pay off for import graphs of remote templates
+    # with a high latency.
+    IMPORT_WORKERS: 1,
+    # Log the numbers of queries and hits of type system caches.
+    LOG_STATISTICS: False,
     TOSCA_NORMATIVE_TYPES: {
         "tosca_simple_yaml_1_0": profiles_directory
         + "/tosca_simple_yaml_1_0/types.yaml",
@@ -99,9 +111,14 @@ class TypeSystem(object):
     TOSCA Type System.
     """
 
-    def __init__(self, configuration):
+    def __init__(self, configuration, previous=None):
         self.types = {}
         self.merged_types = {}
+        # Type system of a previous check of the same template, e.g., in watch
+        # mode, whose merged types are reused when their types are unchanged.
+        self.previous = previous
+        if previous is not None:
+            previous.previous = None  # only keep the last one.
         self.artifact_types = {}
         self.data_types = {
             # YAML types
@@ -129,7 +146,32 @@ class TypeSystem(object):
         self.group_types = {}
         self.policy_types = {}
         self.artifact_types_by_file_ext = {}
-        self.short_names = configuration.get(TYPE_SYSTEM, SHORT_NAMES)
+        # Copy short names as they are extended when namespace prefixed types are loaded.
+        self.short_names = dict(configuration.get(TYPE_SYSTEM, SHORT_NAMES))
+        # Resolved names, False if unchanged, and ancestors of already queried
+        # types, cleared when types or short names are registered.
+        self.type_uris = {}
+        self.ancestors = {}
+        # Type checkers of already checked definitions, by identities of their
+        # definition and previous definition, least recently used first, see
+        # TypeChecker.get_type_checker.
+        self.type_checkers = collections.OrderedDict()
+        # Compiled constraints of already evaluated constraint clauses, see
+        # TypeChecker.compile_constraints.
+        self.compiled_constraints = {}
+        # Indexes of node templates and substituting topology templates by
+        # types, see TypeChecker.get_template_index.
+        self.template_indexes = {}
+        # Relationship types by valid target types, and relationship types
+        # compatible with already queried capability types.
+        self.valid_target_index = None
+        self.compatible_relationship_types = {}
+        # Compatible capabilities of already queried (node type, capability
+        # name, capability type) triples, and the numbers of queries and hits.
+        self.compatible_capabilities = {}
+        self.compatible_capabilities_queries = 0
+        self.compatible_capabilities_hits = 0
+        self.statistics_logged = configuration.get(TYPE_SYSTEM, LOG_STATISTICS)
 
     def is_yaml_type(self, type_name):
         return type_name in [
@@ -143,40 +185,120 @@ class TypeSystem(object):
         ]
 
     def get_type_uri(self, short_type_name):
-        result = short_type_name
-        if self.types.get(short_type_name) is None:
-            type_name = self.short_names.get(short_type_name)
-            if type_name is not None:
-                result = self.get_type_uri(type_name)
+        result = self.type_uris.get(short_type_name)
+        if result is False:
+            # Return the given name as is, as its location can be reported.
+            return short_type_name
+        if result is None:
+            # Follow short names until a type, flattening chains once.
+            visited = [short_type_name]
+            result = short_type_name
+            while self.types.get(result) is None:
+                type_name = self.short_names.get(result)
+                if type_name is None or type_name in visited:
+                    break
+                visited.append(type_name)
+                result = type_name
+            self.type_uris[short_type_name] = (
+                False if result is short_type_name else result
+            )
         return result
 
     def get_type(self, type_name):
         result = self.types.get(type_name)
         if result is None:
-            type_name = self.short_names.get(type_name)
-            if type_name is not None:
-                result = self.get_type(type_name)
+            result = self.types.get(self.get_type_uri(type_name))
         return result
 
+    def register_type(self, type_kind, type_name, type_yaml):
+        """
+        Registers a type of a given kind, e.g., node_types.
+        """
+        self.types[type_name] = type_yaml
+        getattr(self, type_kind)[type_name] = type_yaml
+        self.clear_caches()
+
+    def set_short_name(self, short_name, type_name):
+        self.short_names[short_name] = type_name
+        self.clear_caches()
+
+    def clear_caches(self):
+        """
+        Clears the results computed from the registered types and short names.
+        """
+        self.type_uris.clear()
+        self.ancestors.clear()
+        self.type_checkers.clear()
+        self.compiled_constraints.clear()
+        self.template_indexes.clear()
+        self.valid_target_index = None
+        self.compatible_relationship_types.clear()
+        self.compatible_capabilities.clear()
+
+    def get_ancestors(self, type_name):
+        """
+        Returns the normalized names of a type and of its ancestors, their set,
+        and the type ending the derived_from chain when irregular, i.e., not a
+        map or derived from a non string.
+        """
+        ancestors = self.ancestors.get(type_name)
+        if ancestors is not None:
+            return ancestors
+        names = []
+        irregular_type = None
+        name = type_name
+        while True:
+            # normalize short names
+            name = self.get_type_uri(name)
+            if name in names:
+                break  # cyclic derived_from.
+            names.append(name)
+            type_type = self.get_type(name)
+            if type_type is None:
+                break
+            if not isinstance(type_type, dict) or not isinstance(
+                type_type.get(syntax.DERIVED_FROM, ""), str
+            ):
+                irregular_type = type_type
+                break
+            name = type_type.get(syntax.DERIVED_FROM)
+            if name is None:
+                break
+        ancestors = (names, set(names), irregular_type)
+        self.ancestors[type_name] = ancestors
+        return ancestors
+
     def is_derived_from(self, type_name, derived_from_type_name):
         if type_name is None:
             return False
-        # normalize short names
-        type_name = self.get_type_uri(type_name)
+        names, name_set, irregular_type = self.get_ancestors(type_name)
         if isinstance(derived_from_type_name, str):
-            derived_from_type_name = self.get_type_uri(derived_from_type_name)
-            #
-            if type_name == derived_from_type_name:
+            if self.get_type_uri(derived_from_type_name) in name_set:
                 return True
         elif isinstance(derived_from_type_name, list):
-            if type_name in derived_from_type_name:
-                return True
-        type_type = self.get_type(type_name)
-        if type_type is None:
+            for name in names:
+                if name in derived_from_type_name:
+                    return True
+        if irregular_type is None:
             return False
         return self.is_derived_from(
-            type_type.get(syntax.DERIVED_FROM), derived_from_type_name
-        )
+            irregular_type.get(syntax.DERIVED_FROM), derived_from_type_name
+        )
+
+    def is_unchanged_type(self, type_name):
+        """
+        Is a type and all its ancestors the same in the previous type system?
+        """
+        visited = set()
+        while isinstance(type_name, str) and type_name not in visited:
+            visited.add(type_name)
+            type_yaml = self.get_type(type_name)
+            if type_yaml is not self.previous.get_type(type_name):
+                return False
+            if type_yaml is None:
+                break
+            type_name = type_yaml.get(syntax.DERIVED_FROM)
+        return True
 
     def merge_type(self, type_name):
         if type_name is None:
@@ -187,6 +309,13 @@ class TypeSystem(object):
         if result is not None:
             return result
 
+        # Search the result in the cache of the previous type system.
+        if self.previous is not None:
+            result = self.previous.merged_types.get(type_name)
+            if result is not None and self.is_unchanged_type(type_name):
+                self.merged_types[type_name] = result
+                return result
+
         result = self.get_type(type_name)
         if result is None:
             # TBR            LOGGER.error(CRED + type_name + ' unknown!' + CEND)
@@ -200,7 +329,7 @@ class TypeSystem(object):
 
         derived_from = result.get(syntax.DERIVED_FROM)
         if derived_from is None or self.is_derived_from(derived_from, type_name):
-            result = deepcopy(result)
+            result = copy_yaml(result)
             requirements = result.get(syntax.REQUIREMENTS)
             if requirements:
                 result[syntax.REQUIREMENTS] = normalize_dict(requirements)
@@ -216,7 +345,7 @@ class TypeSystem(object):
 
     def merge_node_type(self, node_type_name):
         result = self.merge_type(node_type_name)
-        result = deepcopy(result)
+        result = copy_yaml(result)
         interfaces = result.get(syntax.INTERFACES)
         if interfaces:
             for (interface_name, interface_yaml) in interfaces.items():
@@ -243,11 +372,74 @@ class TypeSystem(object):
         file_ext = filename[filename.rfind(".")+1:]
         return self.artifact_types_by_file_ext.get(file_ext)
 
+    def get_valid_target_index(self):
+        """
+        Returns the relationship type names, the positions of the relationship
+        types by the normalized names of their valid target types, and the
+        positions of the ones having valid target types which are not strings.
+        """
+        if self.valid_target_index is None:
+            relationship_type_names = list(self.relationship_types)
+            positions_by_valid_target_types = {}
+            unindexed_positions = []
+            for position, relationship_type_name in enumerate(relationship_type_names):
+                relationship_type = self.merge_type(relationship_type_name)
+                for valid_target_type in relationship_type.get(
+                    syntax.VALID_TARGET_TYPES, []
+                ):
+                    if isinstance(valid_target_type, str):
+                        positions_by_valid_target_types.setdefault(
+                            self.get_type_uri(valid_target_type), set()
+                        ).add(position)
+                    else:
+                        unindexed_positions.append(position)
+            self.valid_target_index = (
+                relationship_type_names,
+                positions_by_valid_target_types,
+                unindexed_positions,
+            )
+        return self.valid_target_index
+
     def get_relationship_types_compatible_with_capability_type(
         self, capability_type_name
+    ):
+        if not isinstance(capability_type_name, str):
+            return self.filter_relationship_types_compatible_with_capability_type(
+                list(self.relationship_types), capability_type_name
+            )
+        found_relationship_types = self.compatible_relationship_types.get(
+            capability_type_name
+        )
+        if found_relationship_types is None:
+            (
+                relationship_type_names,
+                positions_by_valid_target_types,
+                unindexed_positions,
+            ) = self.get_valid_target_index()
+            names, name_set, irregular_type = self.get_ancestors(capability_type_name)
+            if irregular_type is None:
+                # Only search the relationship types targeting an ancestor type.
+                positions = set(unindexed_positions)
+                for name in names:
+                    positions.update(positions_by_valid_target_types.get(name, ()))
+                relationship_type_names = [
+                    relationship_type_names[position] for position in sorted(positions)
+                ]
+            found_relationship_types = (
+                self.filter_relationship_types_compatible_with_capability_type(
+                    relationship_type_names, capability_type_name
+                )
+            )
+            self.compatible_relationship_types[
+                capability_type_name
+            ] = found_relationship_types
+        return list(found_relationship_types)
+
+    def filter_relationship_types_compatible_with_capability_type(
+        self, relationship_type_names, capability_type_name
     ):
         found_relationship_types = []
-        for relationship_type_name in list(self.relationship_types):
+        for relationship_type_name in relationship_type_names:
             if self.is_relationship_type_compatible_with_capability_type(
                 relationship_type_name, capability_type_name
             ):
@@ -270,6 +462,25 @@ class TypeSystem(object):
         node_type_name,
         capability_name,
         capability_type_name
+    ):
+        self.compatible_capabilities_queries += 1
+        key = (node_type_name, capability_name, capability_type_name)
+        try:
+            compatible_capabilities = self.compatible_capabilities.get(key)
+        except TypeError:  # unhashable names, not cached.
+            return self.search_compatible_capabilities(*key)
+        if compatible_capabilities is None:
+            compatible_capabilities = self.search_compatible_capabilities(*key)
+            self.compatible_capabilities[key] = compatible_capabilities
+        else:
+            self.compatible_capabilities_hits += 1
+        return list(compatible_capabilities)
+
+    def search_compatible_capabilities(
+        self,
+        node_type_name,
+        capability_name,
+        capability_type_name
     ):
         node_type_def = self.merge_type(
                             self.get_type_uri(
@@ -289,6 +500,20 @@ class TypeSystem(object):
                 compatible_capabilities.append(cap_name)
         return compatible_capabilities
 
+    def log_statistics(self):
+        """
+        Logs the numbers of queries and hits of the caches of this type system
+        when configured.
+        """
+        if not self.statistics_logged:
+            return
+        queries = self.compatible_capabilities_queries
+        hits = self.compatible_capabilities_hits
+        LOGGER.info(
+            "get_compatible_capabilities: %d queries, %d hits (%.1f%%)"
+            % (queries, hits, 100.0 * hits / queries if queries > 0 else 0.0)
+        )
+
 # TOSCA scalar units.
 
 SCALAR_SIZE_UNITS = {
@@ -587,10 +812,13 @@ class ConstraintClauseChecker(object):
         constraint_name,
         check_value,
         check_constraint_operand=lambda value, type_checker: True,
+        compile_operand=None,
     ):
         self.constraint_name = constraint_name
         self.check_value = check_value
         self.check_constraint_operand = check_constraint_operand
+        # Returns a function checking values against a given operand.
+        self.compile_operand = compile_operand
 
     def check_operand(self, value, type_checker):
         return self.check_constraint_operand(value, type_checker)
@@ -598,6 +826,18 @@ class ConstraintClauseChecker(object):
     def check_constraint(self, v1, v2, processor, context_error_message):
         return self.check_value(v1, v2)
 
+    def compile_constraint(self, v2):
+        """
+        Returns a function checking values against an operand.
+        """
+        if self.compile_operand is not None:
+            try:
+                return self.compile_operand(v2)
+            except (LookupError, TypeError, ValueError, re.error):
+                pass  # invalid operand, errors are raised when checking values.
+        check_value = self.check_value
+        return lambda v1: check_value(v1, v2)
+
 
 CONSTRAINT_EQUAL = lambda v1, v2: v1 == v2
 CONSTRAINT_GREATER_THAN = lambda v1, v2: v1 > v2
@@ -618,6 +858,37 @@ def in_range_scalar_unit(v1, v2, units):
     )
 
 
+def compile_in_range_scalar_unit(v2, units):
+    lower_bound = normalize_scalar_unit(v2[0], units)
+    upper_bound = normalize_scalar_unit(v2[1], units)
+    return lambda v1: lower_bound <= normalize_scalar_unit(v1, units) <= upper_bound
+
+
+def compile_compare_scalar_unit(compare, v2, units):
+    bound = normalize_scalar_unit(v2, units)
+    return lambda v1: compare(normalize_scalar_unit(v1, units), bound)
+
+
+def compile_valid_values(v2):
+    # Not used for range, list and map values, which are unhashable.
+    if not isinstance(v2, list):
+        raise TypeError("list expected")
+    valid_values = frozenset(v2)
+
+    def check_valid_values(v1):
+        try:
+            return v1 in valid_values
+        except TypeError:  # unhashable value.
+            return v1 in v2
+
+    return check_valid_values
+
+
+def compile_pattern(v2):
+    fullmatch = re.compile(v2).fullmatch
+    return lambda v1: fullmatch(v1) is not None
+
+
 type_check_operand = lambda operand, type_checker: type_checker(operand)
 type_check_in_range_operand = (
     lambda operand, type_checker: isinstance(operand, list)
@@ -659,24 +930,36 @@ BASIC_CONSTRAINT_CLAUSES = {
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_SIZE_UNITS)
             == normalize_scalar_unit(v2, SCALAR_SIZE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_EQUAL, v2, SCALAR_SIZE_UNITS
+            ),
         ),
         "scalar-unit.time": ConstraintClauseChecker(
             "equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_TIME_UNITS)
             == normalize_scalar_unit(v2, SCALAR_TIME_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_EQUAL, v2, SCALAR_TIME_UNITS
+            ),
         ),
         "scalar-unit.frequency": ConstraintClauseChecker(
             "equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_FREQUENCY_UNITS)
             == normalize_scalar_unit(v2, SCALAR_FREQUENCY_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_EQUAL, v2, SCALAR_FREQUENCY_UNITS
+            ),
         ),
         "scalar-unit.bitrate": ConstraintClauseChecker(
             "equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_BITRATE_UNITS)
             == normalize_scalar_unit(v2, SCALAR_BITRATE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_EQUAL, v2, SCALAR_BITRATE_UNITS
+            ),
         ),
     },
     "greater_than": {
@@ -700,24 +983,36 @@ BASIC_CONSTRAINT_CLAUSES = {
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_SIZE_UNITS)
             > normalize_scalar_unit(v2, SCALAR_SIZE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_THAN, v2, SCALAR_SIZE_UNITS
+            ),
         ),
         "scalar-unit.time": ConstraintClauseChecker(
             "greater_than",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_TIME_UNITS)
             > normalize_scalar_unit(v2, SCALAR_TIME_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_THAN, v2, SCALAR_TIME_UNITS
+            ),
         ),
         "scalar-unit.frequency": ConstraintClauseChecker(
             "greater_than",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_FREQUENCY_UNITS)
             > normalize_scalar_unit(v2, SCALAR_FREQUENCY_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_THAN, v2, SCALAR_FREQUENCY_UNITS
+            ),
         ),
         "scalar-unit.bitrate": ConstraintClauseChecker(
             "greater_than",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_BITRATE_UNITS)
             > normalize_scalar_unit(v2, SCALAR_BITRATE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_THAN, v2, SCALAR_BITRATE_UNITS
+            ),
         ),
     },
     "greater_or_equal": {
@@ -741,24 +1036,36 @@ BASIC_CONSTRAINT_CLAUSES = {
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_SIZE_UNITS)
             >= normalize_scalar_unit(v2, SCALAR_SIZE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_OR_EQUAL, v2, SCALAR_SIZE_UNITS
+            ),
         ),
         "scalar-unit.time": ConstraintClauseChecker(
             "greater_or_equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_TIME_UNITS)
             >= normalize_scalar_unit(v2, SCALAR_TIME_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_OR_EQUAL, v2, SCALAR_TIME_UNITS
+            ),
         ),
         "scalar-unit.frequency": ConstraintClauseChecker(
             "greater_or_equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_FREQUENCY_UNITS)
             >= normalize_scalar_unit(v2, SCALAR_FREQUENCY_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_OR_EQUAL, v2, SCALAR_FREQUENCY_UNITS
+            ),
         ),
         "scalar-unit.bitrate": ConstraintClauseChecker(
             "greater_or_equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_BITRATE_UNITS)
             >= normalize_scalar_unit(v2, SCALAR_BITRATE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_GREATER_OR_EQUAL, v2, SCALAR_BITRATE_UNITS
+            ),
         ),
     },
     "less_than": {
@@ -782,24 +1089,36 @@ BASIC_CONSTRAINT_CLAUSES = {
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_SIZE_UNITS)
             < normalize_scalar_unit(v2, SCALAR_SIZE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_THAN, v2, SCALAR_SIZE_UNITS
+            ),
         ),
         "scalar-unit.time": ConstraintClauseChecker(
             "less_than",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_TIME_UNITS)
             < normalize_scalar_unit(v2, SCALAR_TIME_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_THAN, v2, SCALAR_TIME_UNITS
+            ),
         ),
         "scalar-unit.frequency": ConstraintClauseChecker(
             "less_than",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_FREQUENCY_UNITS)
             < normalize_scalar_unit(v2, SCALAR_FREQUENCY_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_THAN, v2, SCALAR_FREQUENCY_UNITS
+            ),
         ),
         "scalar-unit.bitrate": ConstraintClauseChecker(
             "less_than",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_BITRATE_UNITS)
             < normalize_scalar_unit(v2, SCALAR_BITRATE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_THAN, v2, SCALAR_BITRATE_UNITS
+            ),
         ),
     },
     "less_or_equal": {
@@ -823,24 +1142,36 @@ BASIC_CONSTRAINT_CLAUSES = {
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_SIZE_UNITS)
             <= normalize_scalar_unit(v2, SCALAR_SIZE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_OR_EQUAL, v2, SCALAR_SIZE_UNITS
+            ),
         ),
         "scalar-unit.time": ConstraintClauseChecker(
             "less_or_equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_TIME_UNITS)
             <= normalize_scalar_unit(v2, SCALAR_TIME_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_OR_EQUAL, v2, SCALAR_TIME_UNITS
+            ),
         ),
         "scalar-unit.frequency": ConstraintClauseChecker(
             "less_or_equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_FREQUENCY_UNITS)
             <= normalize_scalar_unit(v2, SCALAR_FREQUENCY_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_OR_EQUAL, v2, SCALAR_FREQUENCY_UNITS
+            ),
         ),
         "scalar-unit.bitrate": ConstraintClauseChecker(
             "less_or_equal",
             lambda v1, v2: normalize_scalar_unit(v1, SCALAR_BITRATE_UNITS)
             <= normalize_scalar_unit(v2, SCALAR_BITRATE_UNITS),
             type_check_operand,
+            lambda v2: compile_compare_scalar_unit(
+                CONSTRAINT_LESS_OR_EQUAL, v2, SCALAR_BITRATE_UNITS
+            ),
         ),
     },
     "in_range": {
@@ -868,44 +1199,69 @@ BASIC_CONSTRAINT_CLAUSES = {
             "in_range",
             lambda v1, v2: in_range_scalar_unit(v1, v2, SCALAR_SIZE_UNITS),
             type_check_in_range_operand,
+            lambda v2: compile_in_range_scalar_unit(v2, SCALAR_SIZE_UNITS),
         ),
         "scalar-unit.time": ConstraintClauseChecker(
             "in_range",
             lambda v1, v2: in_range_scalar_unit(v1, v2, SCALAR_TIME_UNITS),
             type_check_in_range_operand,
+            lambda v2: compile_in_range_scalar_unit(v2, SCALAR_TIME_UNITS),
         ),
         "scalar-unit.frequency": ConstraintClauseChecker(
             "in_range",
             lambda v1, v2: in_range_scalar_unit(v1, v2, SCALAR_FREQUENCY_UNITS),
             type_check_in_range_operand,
+            lambda v2: compile_in_range_scalar_unit(v2, SCALAR_FREQUENCY_UNITS),
         ),
         "scalar-unit.bitrate": ConstraintClauseChecker(
             "in_range",
             lambda v1, v2: in_range_scalar_unit(v1, v2, SCALAR_BITRATE_UNITS),
             type_check_in_range_operand,
+            lambda v2: compile_in_range_scalar_unit(v2, SCALAR_BITRATE_UNITS),
         ),
     },
     "valid_values": {
         "string": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "integer": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "float": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "boolean": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "timestamp": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "null": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "version": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "range": ConstraintClauseChecker(
             "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
@@ -917,16 +1273,28 @@ BASIC_CONSTRAINT_CLAUSES = {
             "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
         ),
         "scalar-unit.size": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "scalar-unit.time": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "scalar-unit.frequency": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
         "scalar-unit.bitrate": ConstraintClauseChecker(
-            "valid_values", CONSTRAINT_VALID_VALUES, type_check_operand
+            "valid_values",
+            CONSTRAINT_VALID_VALUES,
+            type_check_operand,
+            compile_valid_values,
         ),
     },
     "length": {
@@ -946,7 +1314,9 @@ BASIC_CONSTRAINT_CLAUSES = {
     },
     "pattern": {
         "string": ConstraintClauseChecker(
-            "pattern", lambda v1, v2: re.fullmatch(v2, v1) is not None
+            "pattern",
+            lambda v1, v2: re.fullmatch(v2, v1) is not None,
+            compile_operand=compile_pattern,
         ),
     },
     "schema": {
@@ -987,6 +1357,32 @@ TOSCA_FUNCTIONS = {
 REFINE_OR_NEW = None
 PREVIOUSLY_UNDEFINED = {}
 
+# Expected types of the parameters of concat and join functions, and of
+# property mappings, shared so that their type checkers are cached once.
+CONCAT_PARAMETERS_DEFINITION = {
+    "type": "list",
+    "entry_schema": {
+        "type": [
+            "string",
+            "integer",
+            # TODO: add other allowed yaml types
+        ],
+    },
+    "constraints": [{"min_length": 1}],
+}
+JOIN_FIRST_PARAMETER_DEFINITION = {
+    "type": "list",
+    "entry_schema": {"type": "string"},
+}
+PROPERTY_MAPPING_DEFINITION = {
+    "type": "list",
+    "entry_schema": {"type": "string"},
+    "constraints": [{"length": 1}],
+}
+
+# Maximal number of type checkers cached by a type system.
+TYPE_CHECKERS_CACHE_SIZE = 1024
+
 
 class NodeTemplateRequirement(object):
     def __init__(self, node_template_name, requirement_name, requirement_definition):
@@ -1008,6 +1404,9 @@ class TypeChecker(Checker):
 
     def _processor_initialize_(self):
         self.substituting_topology_templates = []
+        # Paths of the TOSCA service templates already loaded into the type system.
+        import_session = self.tosca_service_template.importer.session
+        self.already_loaded_paths = import_session.loaded_paths
         service_template_catalog = self.configuration.get(
             TYPE_SYSTEM, SERVICE_TEMPLATE_CATALOG
         )
@@ -1015,9 +1414,7 @@ class TypeChecker(Checker):
             self.info("No service template catalog to load.")
         else:
             self.info("Loading service template catalog...")
-            from cloudnet.tosca.importers import FilesystemImporter
-
-            importer = FilesystemImporter("")
+            importer = import_session.root_importer
             for service_template in service_template_catalog:
                 self.load_tosca_yaml_template(service_template, importer)
             self.info("Service template catalog loaded.")
@@ -1038,6 +1435,7 @@ class TypeChecker(Checker):
         self.info("TOSCA type checking...")
 
         # Load the used TOSCA normative types according to tosca_definitions_version.
+        tosca_normative_types = None
         if not self.is_tosca_definitions_version_file():
             tosca_normative_types_map = self.configuration.get(
                 TYPE_SYSTEM, TOSCA_NORMATIVE_TYPES
@@ -1060,22 +1458,34 @@ class TypeChecker(Checker):
                 else:
                     self.warning(" no normative types loaded")
                     tosca_normatives_type = None
-            if tosca_normative_types is None:
-                pass  # nothing to do.
-            elif isinstance(tosca_normative_types, str):
-                self.load_tosca_yaml_template(
-                    tosca_normative_types, self.tosca_service_template
-                )
-            elif isinstance(tosca_normative_types, list):
-                for value in tosca_normative_types:
-                    self.load_tosca_yaml_template(value, self.tosca_service_template)
-            else:
-                raise ValueError(
-                    TYPE_CHECKER
-                    + ":"
-                    + TOSCA_NORMATIVE_TYPES
-                    + " must be a string or list"
-                )
+
+        # Parse in parallel the normative types, the tosca template and their imports.
+        paths = [self.tosca_service_template.get_filename()]
+        if isinstance(tosca_normative_types, str):
+            paths.insert(0, tosca_normative_types)
+        elif isinstance(tosca_normative_types, list):
+            paths[:0] = tosca_normative_types
+        # Install the snapshots of the normative types instead of parsing them.
+        for path in paths[:-1]:
+            self.install_profile_snapshot(path)
+        self.resolve_imports(paths)
+
+        if tosca_normative_types is None:
+            pass  # nothing to do.
+        elif isinstance(tosca_normative_types, str):
+            self.load_tosca_yaml_template(
+                tosca_normative_types, self.tosca_service_template
+            )
+        elif isinstance(tosca_normative_types, list):
+            for value in tosca_normative_types:
+                self.load_tosca_yaml_template(value, self.tosca_service_template)
+        else:
+            raise ValueError(
+                TYPE_CHECKER
+                + ":"
+                + TOSCA_NORMATIVE_TYPES
+                + " must be a string or list"
+            )
 
         # Load the tosca template.
         self.load_tosca_yaml_template(
@@ -1088,10 +1498,109 @@ class TypeChecker(Checker):
 
         return True
 
+    def resolve_imports(self, paths):
+        """
+        Parses the templates of the given paths and their transitive imports.
+
+        The import graph is walked level by level, and the templates of a
+        level are parsed in parallel. Parsed templates are cached by their
+        importers, so load_tosca_yaml_template then registers their types in
+        the usual order without parsing them. Failing imports are ignored
+        here and reported by load_tosca_yaml_template as usual.
+        """
+        import_workers = self.configuration.get(TYPE_SYSTEM, IMPORT_WORKERS)
+        if import_workers is None or import_workers < 2:
+            return
+
+        def load(path_and_tosca_service_template):
+            path, tosca_service_template = path_and_tosca_service_template
+            try:
+                return tosca_service_template.imports(path)
+            except Exception:
+                return None
+
+        resolved_fullnames = set()
+        level = [(path, self.tosca_service_template) for path in paths]
+        with concurrent.futures.ThreadPoolExecutor(import_workers) as executor:
+            while len(level) > 0:
+                next_level = {}
+                for tosca_service_template in executor.map(load, level):
+                    if tosca_service_template is None:
+                        continue
+                    fullname = os.path.normpath(tosca_service_template.get_fullname())
+                    if fullname in resolved_fullnames:
+                        continue
+                    resolved_fullnames.add(fullname)
+                    try:
+                        imports = syntax.get_imports(tosca_service_template.get_yaml())
+                    except (AttributeError, ValueError):
+                        continue
+                    for import_yaml in imports:
+                        try:
+                            import_filepath = self.get_import_full_filepath(
+                                import_yaml, report=False
+                            )
+                        except ValueError:
+                            continue
+                        if isinstance(import_filepath, str):
+                            key = (
+                                tosca_service_template.importer.get_fullname(),
+                                import_filepath,
+                            )
+                            next_level.setdefault(
+                                key, (import_filepath, tosca_service_template)
+                            )
+                level = list(next_level.values())
+        self.debug(" %d templates parsed" % len(resolved_fullnames))
+
+    def install_profile_snapshot(self, path):
+        """
+        Installs the snapshot of a profile into the type system if it is not
+        already loaded and the snapshot is up to date. Types are registered as
+        load_tosca_yaml_template would register them.
+        """
+        importer, filename = self.tosca_service_template.importer.get_importer(path)
+        if (
+            not isinstance(importer, importers.FilesystemImporter)
+            or filename in importer.already_loaded_tosca_service_templates
+        ):
+            return
+        loaded = profile_snapshots.load(importer.base_path + filename)
+        if loaded is None:
+            return
+        snapshot, modification_time = loaded
+        fullname = os.path.normpath(importer.get_fullname() + filename)
+        # The snapshot was built into an empty type system.
+        if fullname in self.already_loaded_paths:
+            return
+        for types in snapshot.types.values():
+            for type_name in types:
+                if type_name in self.type_system.types:
+                    return
+        for file_ext in snapshot.artifact_types_by_file_ext:
+            if file_ext in self.type_system.artifact_types_by_file_ext:
+                return
+
+        tosca_service_template = importer.install(
+            filename, snapshot.yaml_content, modification_time
+        )
+        self.already_loaded_paths[fullname] = tosca_service_template
+        for type_kind, types in snapshot.types.items():
+            for type_name, type_yaml in types.items():
+                self.type_system.register_type(type_kind, type_name, type_yaml)
+        for short_name, type_name in snapshot.short_names.items():
+            self.type_system.set_short_name(short_name, type_name)
+        self.type_system.artifact_types_by_file_ext.update(
+            snapshot.artifact_types_by_file_ext
+        )
+        self.debug(" %s installed from its snapshot" % fullname)
+
     def load_tosca_yaml_template(
-        self, path, importer, namescape_prefix="", already_loaded_paths={}
+        self, path, importer, namescape_prefix="", already_loaded_paths=None
     ):
         # Load the tosca service template if not already loaded.
+        if already_loaded_paths is None:
+            already_loaded_paths = self.already_loaded_paths
 
         # TBR
         # tosca_service_template = already_loaded_paths.get(path)
@@ -1190,8 +1699,7 @@ class TypeChecker(Checker):
                         type_yaml
                     )
                 else:
-                    self.type_system.types[full_type_name] = type_yaml
-                    getattr(self.type_system, type_kind)[full_type_name] = type_yaml
+                    self.type_system.register_type(type_kind, full_type_name, type_yaml)
                     self.debug(" %s registered" % full_type_name)
 
                 if namescape_prefix != "":
@@ -1202,7 +1710,7 @@ class TypeChecker(Checker):
                             % (type_name, osn, full_type_name)
                         )
                     self.debug("short_names[%s] = %s" % (type_name, full_type_name))
-                    self.type_system.short_names[type_name] = full_type_name
+                    self.type_system.set_short_name(type_name, full_type_name)
 
         # Associate file extensions to artifact types.
         artifact_types = syntax.get_artifact_types(template_yaml)
@@ -1726,7 +2234,26 @@ class TypeChecker(Checker):
                 return None  # stop infinite loop when derived_from is a cycle relation
 
     def get_type_checker(self, definition, previous_definition, context_error_message):
-        definition = merge_dict(definition, previous_definition)
+        # Search the type checker in the cache. Definitions are kept with
+        # their type checker so that their identities are not reused.
+        if not previous_definition:
+            previous_definition = None  # all empty previous definitions are equal.
+        key = (id(definition), id(previous_definition))
+        type_checkers = self.type_system.type_checkers
+        cached = type_checkers.get(key)
+        if cached is not None:
+            type_checkers.move_to_end(key)
+            return cached[2]
+        type_checker = self.compute_type_checker(definition, previous_definition)
+        type_checkers[key] = (definition, previous_definition, type_checker)
+        # Bound the cache as definitions built per call are cached too.
+        if len(type_checkers) > TYPE_CHECKERS_CACHE_SIZE:
+            type_checkers.popitem(last=False)
+        return type_checker
+
+    def compute_type_checker(self, definition, previous_definition):
+        if previous_definition is not None:
+            definition = merge_dict(definition, previous_definition)
         data_type_name = syntax.get_type(definition)
         if data_type_name is None:
             # TBR            self.error(context_error_message + ' - type expected')
@@ -1794,59 +2321,40 @@ class TypeChecker(Checker):
             # value does not match type_checker
             return # don't check constraints
 
-        def evaluate_constraints(constraint_clauses):
-            def get_constraint_clause_checker(type_name, constraint_clause_checkers):
-                constraint_clause_checker = constraint_clause_checkers.get(type_name)
-                if constraint_clause_checker is None:
-                    # type_name could be a data type
-                    data_type = self.type_system.data_types.get(
-                        self.type_system.get_type_uri(type_name)
-                    )
-                    if data_type is not None:  # data type found
-                        derived_from = data_type.get(syntax.DERIVED_FROM)
-                        if (
-                            derived_from is not None
-                            and not self.type_system.is_derived_from(
-                                derived_from, type_name
-                            )
-                        ):
-                            constraint_clause_checker = get_constraint_clause_checker(
-                                derived_from, constraint_clause_checkers
-                            )
-                return constraint_clause_checker
+        definition_type = definition.get(syntax.TYPE) or previous_definition.get(
+            syntax.TYPE
+        )
 
-            for constraint_clause in constraint_clauses:
-                constraint_clause = normalize_constraint_clause(constraint_clause)
-                for constraint_name, constraint_value in constraint_clause.items():
-                    constraint_clause_checkers = BASIC_CONSTRAINT_CLAUSES.get(
-                        constraint_name
+        def evaluate_constraints(constraint_clauses):
+            if not constraint_clauses:
+                return
+            for (
+                constraint_name,
+                constraint_value,
+                supported,
+                check_constraint,
+            ) in self.compile_constraints(constraint_clauses, definition_type):
+                if not supported:
+                    self.error(
+                        context_error_message
+                        + " - "
+                        + constraint_name
+                        + " unsupported operator",
+                        constraint_name,
                     )
-                    if constraint_clause_checkers is None:
-                        self.error(
-                            context_error_message
-                            + " - "
-                            + constraint_name
-                            + " unsupported operator",
-                            constraint_name,
-                        )
-                        continue
-                    definition_type = definition.get(
-                        syntax.TYPE
-                    ) or previous_definition.get(syntax.TYPE)
-                    constraint_clause_checker = get_constraint_clause_checker(
-                        definition_type, constraint_clause_checkers
+                    continue
+                if check_constraint is None:
+                    self.error(
+                        context_error_message
+                        + " - "
+                        + constraint_name
+                        + " unallowed operator on "
+                        + definition_type
+                        + " value",
+                        value,
                     )
-                    if constraint_clause_checker is None:
-                        self.error(
-                            context_error_message
-                            + " - "
-                            + constraint_name
-                            + " unallowed operator on "
-                            + definition_type
-                            + " value",
-                            value,
-                        )
-                        continue
+                    continue
+                if LOGGER.isEnabledFor(logging.DEBUG):
                     LOGGER.debug(
                         context_error_message
                         + " - evaluate "
@@ -1855,20 +2363,18 @@ class TypeChecker(Checker):
                         + str(constraint_value),
                         constraint_name
                     )
-                    if not constraint_clause_checker.check_constraint(
-                        value, constraint_value, self, context_error_message
-                    ):
-                        self.error(
-                            context_error_message
-                            + ": "
-                            + str(value)
-                            + " - "
-                            + constraint_name
-                            + ": "
-                            + str(constraint_value)
-                            + " failed",
-                            value,
-                        )
+                if not check_constraint(value):
+                    self.error(
+                        context_error_message
+                        + ": "
+                        + str(value)
+                        + " - "
+                        + constraint_name
+                        + ": "
+                        + str(constraint_value)
+                        + " failed",
+                        value,
+                    )
 
         # check that value respects all constraint clauses of the definition type
         data_type_name = syntax.get_type(definition) or syntax.get_type(previous_definition)
@@ -1881,6 +2387,73 @@ class TypeChecker(Checker):
 
         LOGGER.debug(context_error_message + " - checked")
 
+    def get_constraint_clause_checker(self, type_name, constraint_clause_checkers):
+        constraint_clause_checker = constraint_clause_checkers.get(type_name)
+        if constraint_clause_checker is None:
+            # type_name could be a data type
+            data_type = self.type_system.data_types.get(
+                self.type_system.get_type_uri(type_name)
+            )
+            if data_type is not None:  # data type found
+                derived_from = data_type.get(syntax.DERIVED_FROM)
+                if derived_from is not None and not self.type_system.is_derived_from(
+                    derived_from, type_name
+                ):
+                    constraint_clause_checker = self.get_constraint_clause_checker(
+                        derived_from, constraint_clause_checkers
+                    )
+        return constraint_clause_checker
+
+    def compile_constraints(self, constraint_clauses, definition_type):
+        """
+        Returns the constraints of a list of constraint clauses compiled for
+        values of a given type, i.e., (constraint name, constraint value,
+        supported operator, check of values) tuples where the check of values
+        is None if the operator is unsupported or unallowed on the type.
+        """
+        # Search the compiled constraints in the cache. Constraint clauses are
+        # kept with their compiled constraints so that their identities are not
+        # reused.
+        key = (id(constraint_clauses), definition_type)
+        try:
+            cached = self.type_system.compiled_constraints.get(key)
+        except TypeError:  # unhashable definition type, not cached.
+            key = cached = None
+        if cached is not None:
+            return cached[1]
+
+        compiled_constraints = []
+        for constraint_clause in constraint_clauses:
+            constraint_clause = normalize_constraint_clause(constraint_clause)
+            for constraint_name, constraint_value in constraint_clause.items():
+                check_constraint = None
+                constraint_clause_checkers = BASIC_CONSTRAINT_CLAUSES.get(
+                    constraint_name
+                )
+                if constraint_clause_checkers is not None:
+                    constraint_clause_checker = self.get_constraint_clause_checker(
+                        definition_type, constraint_clause_checkers
+                    )
+                    if constraint_clause_checker is not None:
+                        check_constraint = constraint_clause_checker.compile_constraint(
+                            constraint_value
+                        )
+                compiled_constraints.append(
+                    (
+                        constraint_name,
+                        constraint_value,
+                        constraint_clause_checkers is not None,
+                        check_constraint,
+                    )
+                )
+
+        if key is not None:
+            self.type_system.compiled_constraints[key] = (
+                constraint_clauses,
+                compiled_constraints,
+            )
+        return compiled_constraints
+
     def check_constraint_clause(
         self, constraint_clause, type_checker, context_error_message
     ):
@@ -3845,21 +4418,10 @@ class TypeChecker(Checker):
             if "concat" in value:
                 parameters = value["concat"]
                 # check that parameters are a list of strings
-                expected_type_of_parameters = {
-                    "type": "list",
-                    "entry_schema": {
-                        "type": [
-                            "string",
-                            "integer",
-                            # TODO: add other allowed yaml types
-                        ],
-                    },
-                    "constraints": [{"min_length": 1}],
-                }
                 self.check_value_assignment(
                     "concat",
                     parameters,
-                    expected_type_of_parameters,
+                    CONCAT_PARAMETERS_DEFINITION,
                     context_error_message + ":concat",
                 )
 
@@ -3893,13 +4455,7 @@ class TypeChecker(Checker):
                         value)
                 else:
                     # check the first mandatory parameter
-                    expected_type = {
-                        'type': 'list',
-                        'entry_schema': {
-                            'type': 'string'
-                        },
-                    }
-                    self.check_value_assignment('join', parameters[0], expected_type, context_error_message + ':join[0]')
+                    self.check_value_assignment('join', parameters[0], JOIN_FIRST_PARAMETER_DEFINITION, context_error_message + ':join[0]')
 
                     # check the second optional parameter
                     if len(parameters) == 2 and not isinstance(parameters[1], str):
@@ -5441,28 +5997,117 @@ class TypeChecker(Checker):
         # all node filter constraints are matched ;-)
         return True
 
+    def get_template_index(self, templates, index_templates):
+        """
+        Returns the index of a dict or list of templates built by a given
+        function, built again when templates are added.
+        """
+        # Search the index in the cache. Templates are kept with their index
+        # so that their identities are not reused.
+        key = (index_templates.__name__, id(templates))
+        cached = self.type_system.template_indexes.get(key)
+        if cached is not None and cached[1] == len(templates):
+            return cached[2]
+        index = index_templates(templates)
+        self.type_system.template_indexes[key] = (templates, len(templates), index)
+        return index
+
+    def index_node_templates(self, node_templates):
+        """
+        Returns the node templates, the positions of the node templates by the
+        normalized names of their types and ancestor types, and the positions
+        of the node templates whose derived_from chain is irregular.
+        """
+        node_templates = list(node_templates.items())
+        positions_by_types = {}
+        unindexed_positions = []
+        for position, (node_template_name, node_template) in enumerate(
+            node_templates
+        ):
+            node_type_name = node_template.get(syntax.TYPE)
+            if node_type_name is None:
+                continue  # never selected.
+            if not isinstance(node_type_name, str):
+                unindexed_positions.append(position)
+                continue
+            names, name_set, irregular_type = self.type_system.get_ancestors(
+                node_type_name
+            )
+            if irregular_type is not None:
+                unindexed_positions.append(position)
+                continue
+            for name in names:
+                positions_by_types.setdefault(name, []).append(position)
+        return node_templates, positions_by_types, unindexed_positions
+
     def select_node_templates(self, node_type_name, node_filter, context_error_message):
         self.logger.debug(
             context_error_message
             + "- select_node_templates with node_filter =%s" % node_filter
         )
         found_node_templates = []
-        for node_template_name, node_template in (
-            self.get_topology_template().get(syntax.NODE_TEMPLATES, {}).items()
+        node_templates = self.get_topology_template().get(syntax.NODE_TEMPLATES, {})
+        if (
+            isinstance(node_type_name, str)
+            and isinstance(node_templates, dict)
+            and len(node_templates) > 0
         ):
-            if self.type_system.is_derived_from(
-                node_template.get(syntax.TYPE), node_type_name
+            # Only search the node templates derived from node_type_name.
+            (
+                node_templates,
+                positions_by_types,
+                unindexed_positions,
+            ) = self.get_template_index(node_templates, self.index_node_templates)
+            positions = positions_by_types.get(
+                self.type_system.get_type_uri(node_type_name), []
+            ) + [
+                position
+                for position in unindexed_positions
+                if self.type_system.is_derived_from(
+                    node_templates[position][1].get(syntax.TYPE), node_type_name
+                )
+            ]
+            node_templates = [node_templates[position] for position in sorted(positions)]
+        else:
+            node_templates = [
+                (node_template_name, node_template)
+                for node_template_name, node_template in node_templates.items()
+                if self.type_system.is_derived_from(
+                    node_template.get(syntax.TYPE), node_type_name
+                )
+            ]
+        for node_template_name, node_template in node_templates:
+            if node_filter is None or self.eval_node_filter(
+                node_filter, node_template, context_error_message
             ):
-                if node_filter is None or self.eval_node_filter(
-                    node_filter, node_template, context_error_message
-                ):
-                    found_node_templates.append(node_template_name)
+                found_node_templates.append(node_template_name)
         self.logger.debug(
             context_error_message
             + "- select_node_templates found_node_templates =%s" % found_node_templates
         )
         return found_node_templates
 
+    def index_substituting_topology_templates(self, tosca_service_templates):
+        """
+        Returns the substituting topology templates, their positions by the
+        normalized names of their substituted node types, and the positions of
+        the ones whose substituted node type is not a string.
+        """
+        tosca_service_templates = list(tosca_service_templates)
+        positions_by_node_types = {}
+        unindexed_positions = []
+        for position, tosca_service_template in enumerate(tosca_service_templates):
+            node_type_name = tosca_service_template.get_yaml()["topology_template"][
+                "substitution_mappings"
+            ]["node_type"]
+            if isinstance(node_type_name, str):
+                positions_by_node_types.setdefault(
+                    self.type_system.get_type_uri(node_type_name), []
+                ).append(position)
+            else:
+                unindexed_positions.append(position)
+        return tosca_service_templates, positions_by_node_types, unindexed_positions
+
     def search_substituting_topology_templates(
         self, node_template, context_error_message
     ):
@@ -5472,7 +6117,27 @@ class TypeChecker(Checker):
             + " - search_substituting_topology_templates %s" % node_template_type
         )
         found_substituting_topology_templates = []
-        for tosca_service_template in self.substituting_topology_templates:
+        (
+            tosca_service_templates,
+            positions_by_node_types,
+            unindexed_positions,
+        ) = self.get_template_index(
+            self.substituting_topology_templates,
+            self.index_substituting_topology_templates,
+        )
+        if isinstance(node_template_type, str):
+            names, name_set, irregular_type = self.type_system.get_ancestors(
+                node_template_type
+            )
+            if irregular_type is None:
+                # Only search the topology templates substituting an ancestor type.
+                positions = list(unindexed_positions)
+                for name in names:
+                    positions.extend(positions_by_node_types.get(name, []))
+                tosca_service_templates = [
+                    tosca_service_templates[position] for position in sorted(positions)
+                ]
+        for tosca_service_template in tosca_service_templates:
             substitution_mappings = tosca_service_template.get_yaml()[
                 "topology_template"
             ]["substitution_mappings"]
@@ -6568,12 +7233,7 @@ class TypeChecker(Checker):
         context_error_message,
     ):
         def check_mapping(mapping, cem):
-            expected_type = {
-                "type": "list",
-                "entry_schema": {"type": "string"},
-                "constraints": [{"length": 1}],
-            }
-            self.check_value(mapping, expected_type, {}, cem)
+            self.check_value(mapping, PROPERTY_MAPPING_DEFINITION, {}, cem)
             if not isinstance(mapping, list):
                 return  # as this is not a list
             input_name = mapping[0]
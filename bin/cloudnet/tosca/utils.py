@@ -13,7 +13,11 @@
 # Software description: TOSCA to Cloudnet Translator
 ######################################################################
 
+import datetime
 import re
+from copy import copy, deepcopy
+
+from cloudnet.tosca.yaml_line_numbering import DictCoord, ListCoord
 
 SCALAR_UNIT_RE = re.compile("^([0-9]+(\\.[0-9]+)?)( )*([A-Za-z]+)$")
 
@@ -52,28 +56,75 @@ def normalize_name(label):
     return label
 
 
+"""
+    Copy a YAML tree, i.e., maps and lists are copied but scalars are shared
+    as they are immutable.
+"""
+
+
+def copy_yaml(value, memo=None):
+    if value is None or isinstance(value, (str, int, float, datetime.datetime)):
+        return value
+    if memo is None:
+        memo = {}
+    # Keep values referenced several times, e.g., by YAML aliases, shared.
+    result = memo.get(id(value))
+    if result is not None:
+        return result
+    value_type = type(value)
+    if value_type is DictCoord or value_type is dict:
+        result = {} if value_type is dict else DictCoord(value.line, value.column)
+        memo[id(value)] = result
+        for k, v in value.items():
+            result[k] = copy_yaml(v, memo)
+    elif value_type is ListCoord or value_type is list:
+        result = [] if value_type is list else ListCoord(value.line, value.column)
+        memo[id(value)] = result
+        for v in value:
+            result.append(copy_yaml(v, memo))
+    else:
+        result = deepcopy(value)
+        memo[id(value)] = result
+    return result
+
+
 """
     Merge two dictionaries.
 """
 
 
 def merge_dict(d, u):
-    from copy import deepcopy
+    return _merge_dict(copy_dict(d), u)
 
-    d = deepcopy(d)
+
+def copy_dict(d):
+    # Shallow copy keeping line and column.
+    if type(d) is DictCoord:
+        result = DictCoord(d.line, d.column)
+        result.update(d)
+        return result
+    return copy(d)
+
+
+def _merge_dict(d, u):
+    # d is a shallow copy of the merged dictionary, whose nested dictionaries
+    # are copied only when modified, others are shared with the merged one.
     for k, v in u.items():
         if isinstance(v, dict):
             dv = d.get(k)
             if dv is None:
                 dv = {}
-            if not isinstance(dv, dict):
+            elif not isinstance(dv, dict):
                 dv = {"_old_value_": dv}
-            d[k] = merge_dict(dv, v)
+            else:
+                dv = copy_dict(dv)
+            d[k] = _merge_dict(dv, v)
         else:
             if v is not None:
                 old_v = d.get(k)
                 if old_v is not None and isinstance(old_v, dict):
                     # Avoid to lose the previous dictionary.
+                    old_v = d[k] = copy_dict(old_v)
                     old_v[
                         "value"
                     ] = v  # Keep 'value' as key because this has a wanted side effect, find a better way to do that.
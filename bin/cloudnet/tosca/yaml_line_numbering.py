@@ -22,26 +22,79 @@ from yaml.nodes import MappingNode
 
 
 class Coord:
+    """
+    Value annotated with the line and column where it is defined.
+    """
+
+    __slots__ = ()
+
     def init(self, line=0, column=0):
         self.line = line
         self.column = column
 
 
-class StrCoord(str, Coord):
+# Coordinates of str and int values, which can not have non-empty __slots__.
+# They are packed into one int per value and indexed by the value identity,
+# an entry is removed when its value is deleted.
+_coordinates = {}
+
+
+class PackedCoord(Coord):
+    """
+    Coord storing its line and column into the _coordinates table.
+    """
+
+    __slots__ = ()
+
+    @property
+    def line(self):
+        return _coordinates.get(id(self), 0) >> 32
+
+    @line.setter
+    def line(self, line):
+        _coordinates[id(self)] = (line << 32) | self.column
+
+    @property
+    def column(self):
+        return _coordinates.get(id(self), 0) & 0xFFFFFFFF
+
+    @column.setter
+    def column(self, column):
+        _coordinates[id(self)] = (self.line << 32) | column
+
+    def __del__(self):
+        _coordinates.pop(id(self), None)
+
+
+class StrCoord(str, PackedCoord):
+    __slots__ = ()
+
     def __new__(cls, value, line=0, column=0):
         obj = super().__new__(cls, value)
-        Coord.init(obj, line, column)
+        _coordinates[id(obj)] = (line << 32) | column
         return obj
 
+    def __getnewargs__(self):
+        # Pickling and copying keep line and column.
+        return str(self), self.line, self.column
+
+
+class IntCoord(int, PackedCoord):
+    __slots__ = ()
 
-class IntCoord(int, Coord):
     def __new__(cls, value, line=0, column=0):
         obj = super().__new__(cls, value)
-        Coord.init(obj, line, column)
+        _coordinates[id(obj)] = (line << 32) | column
         return obj
 
+    def __getnewargs__(self):
+        # Pickling and copying keep line and column.
+        return int(self), self.line, self.column
+
 
 class FloatCoord(float, Coord):
+    __slots__ = ("line", "column")
+
     def __new__(cls, value, line=0, column=0):
         obj = super().__new__(cls, value)
         Coord.init(obj, line, column)
@@ -49,22 +102,40 @@ class FloatCoord(float, Coord):
 
 
 class DictCoord(dict, Coord):
+    __slots__ = ("line", "column")
+
     def __init__(self, line=0, column=0):
         dict.__init__(self)
         Coord.init(self, line, column)
 
 
 class ListCoord(list, Coord):
+    __slots__ = ("line", "column")
+
     def __init__(self, line=0, column=0):
         list.__init__(self)
         Coord.init(self, line, column)
 
 
 class DatetimeCoord(datetime.datetime, Coord):
-    pass
+    __slots__ = ("line", "column")
+
+    def __reduce_ex__(self, protocol):
+        # datetime pickling and copying forget line and column.
+        cls, args = super().__reduce_ex__(protocol)[:2]
+        return cls, args, (None, {"line": self.line, "column": self.column})
+
+
+# Version of the trees built by the line numbering loader.
+# Must be increased when these trees change, e.g., to invalidate cached trees.
+LOADER_VERSION = 2
+
 
+class LineConstructor(object):
+    """
+    Mixin constructing YAML values annotated with their line and column.
+    """
 
-class SafeLineLoader(yaml.SafeLoader):
     def construct_yaml_int(self, node):
         result = super().construct_yaml_int(node)
         return IntCoord(
@@ -148,29 +219,57 @@ class SafeLineLoader(yaml.SafeLoader):
             mapping[key] = value
         return mapping
 
-SafeLineLoader.add_constructor(
-    "tag:yaml.org,2002:int", SafeLineLoader.construct_yaml_int
-)
 
-SafeLineLoader.add_constructor(
-    "tag:yaml.org,2002:float", SafeLineLoader.construct_yaml_float
-)
+class SafeLineLoader(LineConstructor, yaml.SafeLoader):
+    """
+    Pure Python YAML loader.
+    """
 
-SafeLineLoader.add_constructor(
-    "tag:yaml.org,2002:timestamp", SafeLineLoader.construct_yaml_timestamp
-)
 
-SafeLineLoader.add_constructor(
-    "tag:yaml.org,2002:str", SafeLineLoader.construct_yaml_str
-)
+if hasattr(yaml, "CSafeLoader"):
 
-SafeLineLoader.add_constructor(
-    "tag:yaml.org,2002:seq", SafeLineLoader.construct_yaml_seq
-)
+    class CSafeLineLoader(LineConstructor, yaml.CSafeLoader):
+        """
+        YAML loader based on the libyaml C parser.
+        """
+
+else:
+    CSafeLineLoader = None  # libyaml is not available.
+
+
+def add_line_constructors(loader):
+    """
+    Registers the constructors of values with line and column of a loader.
+    """
+    loader.add_constructor("tag:yaml.org,2002:int", loader.construct_yaml_int)
+    loader.add_constructor("tag:yaml.org,2002:float", loader.construct_yaml_float)
+    loader.add_constructor(
+        "tag:yaml.org,2002:timestamp", loader.construct_yaml_timestamp
+    )
+    loader.add_constructor("tag:yaml.org,2002:str", loader.construct_yaml_str)
+    loader.add_constructor("tag:yaml.org,2002:seq", loader.construct_yaml_seq)
+    loader.add_constructor("tag:yaml.org,2002:map", loader.construct_yaml_map)
+
+
+add_line_constructors(SafeLineLoader)
+if CSafeLineLoader is not None:
+    add_line_constructors(CSafeLineLoader)
+
+
+def safe_line_load(content):
+    """
+    Parses a YAML content with the libyaml C parser when available.
+
+    As libyaml reports errors differently, invalid contents are parsed again
+    by the pure Python loader to report errors in the usual way.
+    """
+    if CSafeLineLoader is not None:
+        try:
+            return yaml.load(content, Loader=CSafeLineLoader)
+        except yaml.YAMLError:
+            pass
+    return yaml.load(content, Loader=SafeLineLoader)
 
-SafeLineLoader.add_constructor(
-    "tag:yaml.org,2002:map", SafeLineLoader.construct_yaml_map
-)
 
 yaml.SafeDumper.add_representer(
     StrCoord, yaml.SafeDumper.represent_str
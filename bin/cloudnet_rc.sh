@@ -23,14 +23,14 @@ fi
 export CLOUDNET_BINDIR
 
 # Generate Alloy and diagram files.
+# All the files are translated in batch mode by one single toscaware run.
 translate()
 {
-  local file
-  for file in "$@"
-  do
-    echo Translate $file...
-    ${CLOUDNET_BINDIR}/toscaware/toscaware "$file"
-  done
+  if [ $# -eq 1 ]
+  then
+    echo Translate $1...
+  fi
+  ${CLOUDNET_BINDIR}/toscaware/toscaware "$@"
 }
 
 # To configure Alloy Parse options, e.g.:
@@ -0,0 +1,105 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Benchmark of the import of TOSCA service templates from a large CSAR.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 archive_import.py [<image size in MB>]
+
+A CSAR bundling a VNF image of the given size next to many compressed
+definitions is generated, then its templates are imported with and without
+prefetching threads.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import cloudnet.tosca.syntax as syntax
+
+NB_DEFINITIONS = 64
+NB_TYPES = 100
+
+
+def write_csar(filename, image_size):
+    with zipfile.ZipFile(filename, "w") as archive:
+        archive.writestr(
+            "TOSCA-Metadata/TOSCA.meta",
+            "TOSCA-Meta-File-Version: 1.0\nEntry-Definitions: Definitions/main.yaml\n",
+        )
+        imports = "".join("  - types_%d.yaml\n" % i for i in range(NB_DEFINITIONS))
+        archive.writestr(
+            "Definitions/main.yaml",
+            "tosca_definitions_version: tosca_simple_yaml_1_3\nimports:\n" + imports,
+            zipfile.ZIP_DEFLATED,
+        )
+        for index in range(NB_DEFINITIONS):
+            types = "".join(
+                "  Type_%d_%d:\n    derived_from: tosca.nodes.Root\n"
+                "    properties:\n      p: {type: string, default: value}\n"
+                % (index, i)
+                for i in range(NB_TYPES)
+            )
+            archive.writestr(
+                "Definitions/types_%d.yaml" % index,
+                "tosca_definitions_version: tosca_simple_yaml_1_3\nnode_types:\n"
+                + types,
+                zipfile.ZIP_DEFLATED,
+            )
+        with archive.open("Artifacts/image.qcow2", "w", force_zip64=True) as stream:
+            chunk = os.urandom(1024 * 1024)
+            for _ in range(image_size):
+                stream.write(chunk)
+
+
+def load(tosca_service_template, loaded):
+    # Imports templates one at a time as the type checker does.
+    if tosca_service_template.get_fullname() in loaded:
+        return
+    loaded.add(tosca_service_template.get_fullname())
+    for import_yaml in syntax.get_imports(tosca_service_template.get_yaml()):
+        load(tosca_service_template.imports(syntax.get_import_file(import_yaml)), loaded)
+
+
+def main(argv):
+    image_size = int(argv[0]) if len(argv) > 0 else 256
+    filename = os.path.join(tempfile.mkdtemp(), "vnf.csar")
+    write_csar(filename, image_size)
+    print("%s: %d MB" % (filename, os.path.getsize(filename) // (1024 * 1024)))
+
+    for workers in [0, 8]:
+        config = copy.deepcopy(configuration.DEFAULT_CONFIGURATION)
+        config[importers.IMPORTER][importers.PREFETCH_WORKERS] = workers
+        config[importers.IMPORTER][importers.ARCHIVE_PARALLEL_ENTRIES] = 8
+        importers.configure(configuration.Configuration(config))
+        loaded = set()
+        start = time.perf_counter()
+        load(importers.imports(filename), loaded)
+        duration = time.perf_counter() - start
+        print(
+            "%d templates imported with %d prefetch workers in %.3f s"
+            % (len(loaded), workers, duration)
+        )
+    os.remove(filename)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,93 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Benchmark of the memory used by parsed YAML trees and their coordinates.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 coordinates_memory.py [<directory> ...]
+
+By default, YAML files and CSAR archives of the kubetos and TosKer examples
+are parsed (run examples/kubetos/run.sh first to clone kubetos templates).
+"""
+
+import glob
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+
+import yaml
+from cloudnet.tosca.yaml_line_numbering import safe_line_load
+
+EXAMPLES_DIRECTORY = os.path.join(os.path.dirname(__file__), "../../examples")
+DEFAULT_DIRECTORIES = [
+    os.path.join(EXAMPLES_DIRECTORY, "kubetos"),
+    os.path.join(EXAMPLES_DIRECTORY, "TosKer"),
+]
+
+
+def read_contents(directory):
+    contents = []
+    for filename in sorted(glob.glob(directory + "/**/*", recursive=True)):
+        if filename.endswith((".yaml", ".yml")):
+            with open(filename, "rb") as stream:
+                contents.append(stream.read())
+        elif filename.endswith((".csar", ".zip")) and zipfile.is_zipfile(filename):
+            with zipfile.ZipFile(filename) as archive:
+                for name in archive.namelist():
+                    if name.endswith((".yaml", ".yml")):
+                        contents.append(archive.read(name))
+    return contents
+
+
+def count_values(value):
+    if isinstance(value, dict):
+        return 1 + sum(count_values(k) + count_values(v) for k, v in value.items())
+    if isinstance(value, list):
+        return 1 + sum(count_values(v) for v in value)
+    return 1
+
+
+def main(argv):
+    directories = argv if len(argv) > 0 else DEFAULT_DIRECTORIES
+    contents = []
+    for directory in directories:
+        contents.extend(read_contents(directory))
+    print(
+        "%d YAML files, %d bytes" % (len(contents), sum(len(c) for c in contents))
+    )
+    trees = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for content in contents:
+        try:
+            trees.append(safe_line_load(content))
+        except yaml.YAMLError:
+            pass
+    duration = time.perf_counter() - start
+    memory, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nb_values = sum(count_values(tree) for tree in trees)
+    print("%d parsed values in %.3f s" % (nb_values, duration))
+    print(
+        "%d kB used by parsed trees, i.e., %.1f bytes per value"
+        % (memory // 1024, memory / max(nb_values, 1))
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
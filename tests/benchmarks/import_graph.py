@@ -0,0 +1,84 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Benchmark of the parallel parsing of the import graph by the type checker.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 import_graph.py [<latency in seconds>]
+
+A local HTTP server serves a deep tree of TOSCA type files, each one answered
+after the given latency. A template importing this tree is type checked
+with one and several import workers, without prefetching of HTTP imports.
+"""
+
+import copy
+import functools
+import http.server
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+from cloudnet.tosca.type_system import (
+    IMPORT_WORKERS,
+    TYPE_SYSTEM,
+    TypeChecker,
+    TypeSystem,
+)
+from url_prefetch import SlowHandler, write_tree
+
+
+def main(argv):
+    SlowHandler.latency = float(argv[0]) if len(argv) > 0 else 0.05
+    directory = tempfile.mkdtemp()
+    write_tree(directory, "root", 3)
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(SlowHandler, directory=directory)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    template_file = os.path.join(directory, "template.yaml")
+    with open(template_file, "w") as stream:
+        stream.write(
+            "tosca_definitions_version: tosca_simple_yaml_1_3\n"
+            "imports:\n  - http://127.0.0.1:%d/root.yaml\n" % server.server_address[1]
+        )
+    logging.disable(logging.WARNING)
+
+    for import_workers in [1, 8]:
+        config = copy.deepcopy(configuration.DEFAULT_CONFIGURATION)
+        config[importers.IMPORTER][importers.PREFETCH_WORKERS] = 0
+        config[TYPE_SYSTEM][IMPORT_WORKERS] = import_workers
+        config = configuration.Configuration(config)
+        importers.configure(config)
+        start = time.perf_counter()
+        type_checker = TypeChecker(
+            importers.imports(template_file), config, TypeSystem(config)
+        )
+        type_checker.check()
+        duration = time.perf_counter() - start
+        print(
+            "%d types checked with %d import workers in %.3f s"
+            % (len(type_checker.type_system.types), import_workers, duration)
+        )
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,108 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Benchmark of the start-up time of tosca2cloudnet.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 startup_time.py [<runs>]
+
+The import of tosca2cloudnet and the translation of a template stopped at
+syntax checking are measured with python -X importtime. The exit status is 1
+if modules that must be imported only when needed are imported by them.
+jsonschema is needed by syntax checking only.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+TOSCA2CLOUDNET = os.path.join(
+    os.path.dirname(__file__), "../../bin/cloudnet/tosca/tosca2cloudnet.py"
+)
+
+# Modules imported only when needed.
+GENERATOR_MODULES = [
+    "cloudnet.tosca.alloy",
+    "cloudnet.tosca.declarative_workflows",
+    "cloudnet.tosca.hot",
+    "cloudnet.tosca.network_diagrams",
+    "cloudnet.tosca.tosca_diagrams",
+    "cloudnet.tosca.uml2_diagrams",
+]
+
+
+def run(args):
+    """
+    Run python -X importtime, return the wall time, the total import time and
+    the cumulative import times by module, in seconds.
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    duration = time.perf_counter() - start
+    total_import_time = 0
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            own, cumulative, module = line[len("import time:") :].split("|")
+            if own.strip().isdigit():
+                total_import_time += int(own) / 1e6
+                import_times[module.strip()] = int(cumulative) / 1e6
+    return duration, total_import_time, import_times
+
+
+def main(argv):
+    runs = int(argv[0]) if len(argv) > 0 else 5
+    directory = tempfile.mkdtemp()
+    template_file = os.path.join(directory, "syntax_error.yaml")
+    with open(template_file, "w") as stream:
+        stream.write("tosca_definitions_version: tosca_simple_yaml_1_3\nunknown: 1\n")
+
+    status = 0
+    for title, args, lazy_modules in [
+        (
+            "import tosca2cloudnet",
+            ["-c", "import cloudnet.tosca.tosca2cloudnet"],
+            ["requests", "jsonschema"] + GENERATOR_MODULES,
+        ),
+        (
+            "translate a syntax error",
+            [TOSCA2CLOUDNET, "--template-file", template_file],
+            ["requests"] + GENERATOR_MODULES,
+        ),
+    ]:
+        results = sorted(
+            (run(args) for _ in range(runs)), key=lambda result: result[0]
+        )
+        duration, total_import_time, import_times = results[len(results) // 2]
+        print(
+            "%s: %.3f s median wall time, %.3f s importing modules"
+            % (title, duration, total_import_time)
+        )
+        for module in lazy_modules:
+            if module in import_times:
+                print("  %s imported in %.3f s" % (module, import_times[module]))
+                status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
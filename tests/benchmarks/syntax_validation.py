@@ -0,0 +1,100 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Benchmark of the syntax validation of TOSCA templates.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 syntax_validation.py [<runs>] [<template files>]
+
+The validation of the valid examples against their TOSCA schemas is measured
+with the compiled validity check and with jsonschema. The exit status is 1 if
+they disagree on a template.
+"""
+
+import glob
+import os
+import sys
+import time
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import cloudnet.tosca.syntax as syntax
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "../../examples")
+TEMPLATE_FILES = sorted(
+    glob.glob(os.path.join(EXAMPLES, "OASIS_TOSCA_1.2/*.yaml"))
+    + glob.glob(os.path.join(EXAMPLES, "TOSCA_1.3_NFV_Topology/*.yaml"))
+)
+
+
+def measure(function, template_yaml, runs):
+    """
+    Returns the best duration of a validation in seconds and its result.
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function(template_yaml)
+        durations.append(time.perf_counter() - start)
+    return min(durations), result
+
+
+def main(argv):
+    runs = int(argv[0]) if len(argv) > 0 else 5
+    template_files = argv[1:] if len(argv) > 1 else TEMPLATE_FILES
+    schema_files = configuration.DEFAULT_CONFIGURATION[syntax.SYNTAX][
+        syntax.TOSCA_DEFINITIONS_VERSION
+    ]
+    import_session = importers.ImportSession()
+
+    status = 0
+    nb_templates = 0
+    compiled_time = jsonschema_time = 0
+    for template_file in template_files:
+        if os.path.basename(template_file) == "tosca2cloudnet.yaml":
+            continue
+        with open(template_file, "rb") as stream:
+            template_yaml = importers.parse_yaml(stream.read())
+        schema_file = schema_files.get(
+            template_yaml.get(syntax.TOSCA_DEFINITIONS_VERSION)
+        )
+        if schema_file is None:
+            continue
+        tosca_schema = import_session.imports(schema_file).get_yaml()
+        validator, is_valid = syntax.get_validator(schema_file, tosca_schema)
+        if is_valid is None:
+            print("[ERROR] %s not compiled" % schema_file, file=sys.stderr)
+            return 1
+        duration, compiled_result = measure(is_valid, template_yaml, runs)
+        compiled_time += duration
+        duration, jsonschema_result = measure(
+            lambda template_yaml: len(list(validator.iter_errors(template_yaml))) == 0,
+            template_yaml,
+            runs,
+        )
+        jsonschema_time += duration
+        if compiled_result != jsonschema_result:
+            print("[ERROR] %s: validity checks disagree" % template_file)
+            status = 1
+        nb_templates += 1
+    print(
+        "%d templates: %.1f ms with the compiled check, %.1f ms with jsonschema"
+        % (nb_templates, compiled_time * 1000, jsonschema_time * 1000)
+    )
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,124 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Micro-benchmarks of the type lookups of TypeSystem.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 type_lookups.py [<runs>] [<template file>]
+
+The template, TopologyVNFD.yaml of the ETSI NFV SOL001 example by default,
+is type checked, then get_type_uri, get_type and is_derived_from are
+measured for all its type names and short names, with their caches cleared
+before each run (cold) or kept (warm).
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import cloudnet.tosca.tosca2cloudnet as tosca2cloudnet
+
+TEMPLATE_FILE = os.path.join(
+    os.path.dirname(__file__),
+    "../../examples/TOSCA_1.3_NFV_Topology/TopologyVNFD.yaml",
+)
+
+
+def measure(title, lookups, clear_caches, runs):
+    """
+    Prints the best duration of a lookup, with caches cleared or kept.
+    """
+    for mode in ["cold", "warm"]:
+        durations = []
+        for _ in range(runs):
+            if mode == "cold":
+                clear_caches()
+            start = time.perf_counter()
+            for lookup in lookups:
+                lookup()
+            durations.append(time.perf_counter() - start)
+        print(
+            "%s %s: %.0f ns per lookup"
+            % (title, mode, min(durations) / len(lookups) * 1e9)
+        )
+
+
+def main(argv):
+    runs = int(argv[0]) if len(argv) > 0 else 20
+    template_file = argv[1] if len(argv) > 1 else TEMPLATE_FILE
+    os.chdir(os.path.dirname(os.path.abspath(template_file)))
+    config = configuration.load([configuration.CONFIGURATION_FILE])
+
+    # Type check the template, without generating anything.
+    import_session = importers.ImportSession()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        tosca2cloudnet.translate(
+            os.path.basename(template_file), config, import_session, generate=False
+        )
+    type_system = import_session.type_system
+    root_types = [type_name for type_name in type_system.types if ".Root" in type_name]
+
+    def clear_caches():
+        for cache_name in ["type_uris", "ancestors"]:
+            cache = getattr(type_system, cache_name, None)
+            if cache is not None:
+                cache.clear()
+
+    for names_title, type_names in [
+        ("type names", list(type_system.types)),
+        ("short names", list(type_system.short_names)),
+    ]:
+        print("%d %s:" % (len(type_names), names_title))
+        measure(
+            "  get_type_uri",
+            [
+                lambda type_name=type_name: type_system.get_type_uri(type_name)
+                for type_name in type_names
+            ],
+            clear_caches,
+            runs,
+        )
+        measure(
+            "  get_type",
+            [
+                lambda type_name=type_name: type_system.get_type(type_name)
+                for type_name in type_names
+            ],
+            clear_caches,
+            runs,
+        )
+        measure(
+            "  is_derived_from %d root types" % len(root_types),
+            [
+                lambda type_name=type_name, root_type=root_type: (
+                    type_system.is_derived_from(type_name, root_type)
+                )
+                for type_name in type_names
+                for root_type in root_types
+            ],
+            clear_caches,
+            runs,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,110 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Benchmark of the prefetching of HTTP imports.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 url_prefetch.py [<latency in seconds>]
+
+A local HTTP server serves a tree of TOSCA type files, each one answered
+after the given latency, which are imported with and without prefetching.
+"""
+
+import copy
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import cloudnet.tosca.syntax as syntax
+
+TREE_DEPTH = 3
+TREE_WIDTH = 3
+SESSIONS = 3
+
+
+def write_tree(directory, name, depth):
+    imports = []
+    if depth > 0:
+        for index in range(TREE_WIDTH):
+            child = "%s_%d" % (name, index)
+            write_tree(directory, child, depth - 1)
+            imports.append(child + ".yaml")
+    with open(os.path.join(directory, name + ".yaml"), "w") as stream:
+        stream.write("tosca_definitions_version: tosca_simple_yaml_1_3\n")
+        if imports:
+            stream.write("imports:\n")
+            for filename in imports:
+                stream.write("  - %s\n" % filename)
+        stream.write("node_types:\n  %s:\n    derived_from: tosca.nodes.Root\n" % name)
+
+
+class SlowHandler(http.server.SimpleHTTPRequestHandler):
+    latency = 0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load(tosca_service_template, loaded):
+    # Imports templates one at a time as the type checker does.
+    if tosca_service_template.get_fullname() in loaded:
+        return
+    loaded.add(tosca_service_template.get_fullname())
+    for import_yaml in syntax.get_imports(tosca_service_template.get_yaml()):
+        load(tosca_service_template.imports(syntax.get_import_file(import_yaml)), loaded)
+
+
+def main(argv):
+    SlowHandler.latency = float(argv[0]) if len(argv) > 0 else 0.05
+    directory = tempfile.mkdtemp()
+    write_tree(directory, "root", TREE_DEPTH)
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(SlowHandler, directory=directory)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:%d/root.yaml" % server.server_address[1]
+
+    for workers in [0, 8]:
+        config = copy.deepcopy(configuration.DEFAULT_CONFIGURATION)
+        config[importers.IMPORTER][importers.PREFETCH_WORKERS] = workers
+        importers.configure(configuration.Configuration(config))
+        # Successive sessions, e.g., of batch mode, are prefetched independently.
+        for index in range(SESSIONS):
+            session = importers.ImportSession()
+            loaded = set()
+            start = time.perf_counter()
+            load(session.imports(url), loaded)
+            duration = time.perf_counter() - start
+            session.close()
+            print(
+                "%d templates imported with %d prefetch workers in %.3f s"
+                % (len(loaded), workers, duration)
+            )
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,66 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Benchmarks for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Benchmark of the pure Python and libyaml based line numbering YAML loaders.
+
+Usage, from the tests/benchmarks directory:
+    PYTHONPATH=../../bin python3 yaml_loaders.py [<directory>]
+
+By default, all the YAML files of the examples directory are parsed.
+"""
+
+import glob
+import os
+import sys
+import time
+
+import yaml
+from cloudnet.tosca.yaml_line_numbering import CSafeLineLoader, SafeLineLoader
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(__file__), "../../examples")
+
+
+def parse_all(contents, loader):
+    start = time.perf_counter()
+    for content in contents:
+        try:
+            yaml.load(content, Loader=loader)
+        except yaml.YAMLError:
+            pass
+    return time.perf_counter() - start
+
+
+def main(argv):
+    directory = argv[0] if len(argv) > 0 else DEFAULT_DIRECTORY
+    contents = []
+    for pattern in ["**/*.yaml", "**/*.yml"]:
+        for filename in glob.glob(os.path.join(directory, pattern), recursive=True):
+            with open(filename, "rb") as stream:
+                contents.append(stream.read())
+    print(
+        "%d YAML files, %d bytes" % (len(contents), sum(len(c) for c in contents))
+    )
+    python_time = parse_all(contents, SafeLineLoader)
+    print("SafeLineLoader : %8.3f s" % python_time)
+    if CSafeLineLoader is None:
+        print("CSafeLineLoader: unavailable as PyYAML is not built with libyaml")
+        return 0
+    c_time = parse_all(contents, CSafeLineLoader)
+    print("CSafeLineLoader: %8.3f s (x%.1f)" % (c_time, python_time / c_time))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,175 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Tests for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Test of the incremental translation driven by the build manifest.
+
+Usage, from the tests directory:
+    PYTHONPATH=../bin python3 build_manifest.py
+
+Templates are translated by tosca2cloudnet in a temporary directory whose
+configuration records a build manifest. An unchanged template must replay its
+recorded outputs and exit status, while a template whose imported local file,
+configuration or generated artifact changed must be translated again, and a
+template importing a remote template must never be recorded. The exit status
+is 1 if the manifest does not behave as expected.
+"""
+
+import functools
+import http.server
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+TOSCA2CLOUDNET = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../bin/cloudnet/tosca/tosca2cloudnet.py")
+)
+BINDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../bin"))
+MANIFEST_FILE = "RESULTS/build-manifest.json"
+
+CONFIGURATION = """\
+Generator:
+  build-manifest: %s
+Alloy:
+  target-directory: RESULTS/Alloy
+""" % MANIFEST_FILE
+
+TYPES = """\
+tosca_definitions_version: tosca_simple_yaml_1_3
+node_types:
+  Server:
+    derived_from: tosca.nodes.Compute
+"""
+
+TEMPLATE = """\
+tosca_definitions_version: tosca_simple_yaml_1_3
+imports:
+  - %s
+topology_template:
+  node_templates:
+    server:
+      type: Server
+"""
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def write(directory, filename, content, mode="w"):
+    with open(os.path.join(directory, filename), mode) as stream:
+        stream.write(content)
+
+
+def translate(directory, template_file):
+    """
+    Translate a template, return its exit status and console outputs, and
+    whether it was translated or its recorded outputs were replayed.
+    """
+    process = subprocess.run(
+        [sys.executable, TOSCA2CLOUDNET, "--template-file", template_file],
+        cwd=directory,
+        env=dict(os.environ, PYTHONPATH=BINDIR),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    replayed_line = "%s unchanged since its last translation.\n" % template_file
+    replayed = replayed_line in process.stdout
+    stdout = process.stdout.replace(replayed_line, "", 1)
+    return (process.returncode, stdout, process.stderr), replayed
+
+
+def get_entry(directory, template_file):
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as stream:
+            return json.load(stream)["templates"].get(template_file)
+    except OSError:
+        return None
+
+
+def main(argv):
+    directory = tempfile.mkdtemp()
+    write(directory, "tosca2cloudnet.yaml", CONFIGURATION)
+    write(directory, "types.yaml", TYPES)
+    write(directory, "main.yaml", TEMPLATE % "types.yaml")
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    write(
+        directory,
+        "remote.yaml",
+        TEMPLATE % ("http://127.0.0.1:%d/types.yaml" % server.server_address[1]),
+    )
+
+    status = 0
+
+    def check(title, condition):
+        nonlocal status
+        print("%s: %s" % (title, "ok" if condition else "failed"))
+        if not condition:
+            status = 1
+
+    outputs, replayed = translate(directory, "main.yaml")
+    check("first translation", not replayed and get_entry(directory, "main.yaml"))
+    replayed_outputs, replayed = translate(directory, "main.yaml")
+    check("unchanged template replayed", replayed and replayed_outputs == outputs)
+
+    for title, modify in [
+        (
+            "imported local file modified",
+            lambda: write(directory, "types.yaml", "# modified\n", "a"),
+        ),
+        (
+            "configuration modified",
+            lambda: write(
+                directory,
+                "tosca2cloudnet.yaml",
+                "Importer:\n  prefetch-workers: 2\n",
+                "a",
+            ),
+        ),
+        (
+            "generated artifact modified",
+            lambda: write(
+                directory,
+                next(iter(get_entry(directory, "main.yaml")["artifacts"])),
+                "// modified\n",
+                "a",
+            ),
+        ),
+    ]:
+        modify()
+        _, replayed = translate(directory, "main.yaml")
+        check(title, not replayed)
+        _, replayed = translate(directory, "main.yaml")
+        check(title + ", then replayed", replayed)
+
+    for index in range(2):
+        _, replayed = translate(directory, "remote.yaml")
+        check(
+            "remote import translated %d" % index,
+            not replayed and get_entry(directory, "remote.yaml") is None,
+        )
+    server.shutdown()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
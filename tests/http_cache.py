@@ -0,0 +1,173 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Tests for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Test of the persistent cache of HTTP imports.
+
+Usage, from the tests directory:
+    PYTHONPATH=../bin python3 http_cache.py
+
+A local HTTP server serves a TOSCA type file, which is got through the HTTP
+cache while it is fresh, expired and revalidated, modified, answered with a
+server error, unreachable, and in offline mode. The exit status is 1 if the
+cache does not behave as expected.
+"""
+
+import copy
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+
+TTL = 3600
+
+
+class RecordingHandler(http.server.SimpleHTTPRequestHandler):
+    # Status answered instead of the served file if not None.
+    error_status = None
+
+    def do_GET(self):
+        if self.error_status is not None:
+            self.send_error(self.error_status)
+        else:
+            super().do_GET()
+
+    def log_request(self, code="-", size="-"):
+        self.server.statuses.append(int(code))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_template(filename, node_type, modification_time):
+    with open(filename, "w") as stream:
+        stream.write(
+            "tosca_definitions_version: tosca_simple_yaml_1_3\n"
+            "node_types:\n  %s:\n    derived_from: tosca.nodes.Root\n" % node_type
+        )
+    os.utime(filename, (modification_time, modification_time))
+
+
+def configure(cache_directory, ttl, offline=False):
+    config = copy.deepcopy(configuration.DEFAULT_CONFIGURATION)
+    config[importers.IMPORTER][importers.PREFETCH_WORKERS] = 0
+    config[importers.IMPORTER][importers.HTTP_CACHE_DIRECTORY] = cache_directory
+    config[importers.IMPORTER][importers.HTTP_CACHE_TTL] = ttl
+    config[importers.IMPORTER][importers.OFFLINE] = offline
+    importers.configure(configuration.Configuration(config))
+
+
+def get_node_types(url):
+    try:
+        yaml_content = importers.get_url(importers.import_requests(), url)
+    except FileNotFoundError:
+        return None
+    return list(yaml_content["node_types"])
+
+
+def main(argv):
+    directory = tempfile.mkdtemp()
+    cache_directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, "types.yaml")
+    modification_time = time.time() - 60
+    write_template(filename, "Original", modification_time)
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(RecordingHandler, directory=directory)
+    )
+    server.statuses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:%d/types.yaml" % server.server_address[1]
+    missing_url = "http://127.0.0.1:%d/missing.yaml" % server.server_address[1]
+
+    status = 0
+    # Each step gets the URL and gives the expected node types and statuses.
+    for title, step, expected_node_types, expected_statuses in [
+        (
+            "first get",
+            lambda: configure(cache_directory, TTL),
+            ["Original"],
+            [200],
+        ),
+        (
+            "fresh entry",
+            lambda: None,
+            ["Original"],
+            [],
+        ),
+        (
+            "expired entry revalidated",
+            lambda: configure(cache_directory, 0),
+            ["Original"],
+            [304],
+        ),
+        (
+            "expired entry modified",
+            lambda: write_template(filename, "Modified", modification_time + 10),
+            ["Modified"],
+            [200],
+        ),
+        (
+            "expired entry with a server error",
+            lambda: setattr(RecordingHandler, "error_status", 503),
+            ["Modified"],
+            [503],
+        ),
+        (
+            "expired entry with an unreachable server",
+            lambda: server.shutdown() or server.server_close(),
+            ["Modified"],
+            [],
+        ),
+        (
+            "expired entry offline",
+            lambda: configure(cache_directory, 0, offline=True),
+            ["Modified"],
+            [],
+        ),
+    ]:
+        step()
+        server.statuses.clear()
+        node_types = get_node_types(url)
+        if node_types == expected_node_types and server.statuses == expected_statuses:
+            print("%s: ok" % title)
+        else:
+            print(
+                "%s: %s got with HTTP statuses %s instead of %s with %s"
+                % (
+                    title,
+                    node_types,
+                    server.statuses,
+                    expected_node_types,
+                    expected_statuses,
+                )
+            )
+            status = 1
+
+    # Offline, URLs not cached are not found.
+    if get_node_types(missing_url) is None:
+        print("not cached entry offline: ok")
+    else:
+        print("not cached entry offline: found")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,147 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Tests for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Test of the prefetching of HTTP imports.
+
+Usage, from the tests directory:
+    PYTHONPATH=../bin python3 prefetch.py
+
+A local HTTP server serves a tree of TOSCA type files, imported by successive
+import sessions. The transitive imports of a template must be prefetched for
+each session, each file must be requested once per session, and imports
+prefetched but not consumed by an ended session must not be served to the
+next ones. The exit status is 1 if prefetching does not behave as expected.
+"""
+
+import copy
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import cloudnet.tosca.syntax as syntax
+
+# Imports of each served file.
+TREE = {
+    "root.yaml": ["a.yaml", "b.yaml"],
+    "a.yaml": ["c.yaml"],
+    "b.yaml": [],
+    "c.yaml": [],
+}
+
+
+class RecordingHandler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path.lstrip("/"))
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_file(directory, filename, description):
+    with open(os.path.join(directory, filename), "w") as stream:
+        stream.write("tosca_definitions_version: tosca_simple_yaml_1_3\n")
+        stream.write("description: %s\n" % description)
+        if TREE[filename]:
+            stream.write("imports:\n")
+            for imported_file in TREE[filename]:
+                stream.write("  - %s\n" % imported_file)
+
+
+def load(tosca_service_template, descriptions):
+    # Imports templates one at a time as the type checker does.
+    name = os.path.basename(tosca_service_template.get_fullname())
+    if name in descriptions:
+        return
+    descriptions[name] = tosca_service_template.get_yaml()["description"]
+    for import_yaml in syntax.get_imports(tosca_service_template.get_yaml()):
+        import_file = syntax.get_import_file(import_yaml)
+        load(tosca_service_template.imports(import_file), descriptions)
+
+
+def wait_for(server, paths):
+    # Prefetching threads request the imports in the background.
+    deadline = time.time() + 5
+    while sorted(server.paths) != sorted(paths) and time.time() < deadline:
+        time.sleep(0.01)
+    return sorted(server.paths) == sorted(paths)
+
+
+def main(argv):
+    directory = tempfile.mkdtemp()
+    for filename in TREE:
+        write_file(directory, filename, "original")
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(RecordingHandler, directory=directory)
+    )
+    server.paths = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:%d/root.yaml" % server.server_address[1]
+    config = copy.deepcopy(configuration.DEFAULT_CONFIGURATION)
+    config[importers.IMPORTER][importers.PREFETCH_WORKERS] = 4
+    importers.configure(configuration.Configuration(config))
+
+    status = 0
+
+    def check(title, condition):
+        nonlocal status
+        print("%s: %s" % (title, "ok" if condition else "failed"))
+        if not condition:
+            status = 1
+
+    for index in range(3):
+        session = importers.ImportSession()
+        server.paths.clear()
+        root = session.imports(url)
+        check(
+            "session %d: imports prefetched" % index, wait_for(server, list(TREE))
+        )
+        descriptions = {}
+        load(root, descriptions)
+        check(
+            "session %d: each file requested once" % index,
+            sorted(server.paths) == sorted(TREE) and len(descriptions) == len(TREE),
+        )
+        session.close()
+
+    # A session ending before consuming its prefetched imports.
+    session = importers.ImportSession()
+    server.paths.clear()
+    session.imports(url)
+    wait_for(server, list(TREE))
+    session.close()
+    check("prefetched imports dropped", not session.prefetches)
+    for filename in TREE:
+        write_file(directory, filename, "modified")
+    session = importers.ImportSession()
+    descriptions = {}
+    load(session.imports(url), descriptions)
+    session.close()
+    check(
+        "dropped imports not served",
+        set(descriptions.values()) == {"modified"},
+    )
+    server.shutdown()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
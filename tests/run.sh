@@ -44,6 +44,53 @@ check_regression()
   fi
 }
 
+# Check that translating templates in one batch, sequentially or in parallel,
+# generates the same files and diagnostics as translating them one by one,
+# i.e., that no state is kept from a template to the next one.
+check_batch_consistency()
+{
+  local directory=$1
+  shift
+  local bindir single_dir batch_dir jobs_dir file
+  bindir="$(cd "${CLOUDNET_BINDIR}" && pwd)"
+  # Translated copies are under the current directory mounted by toscaware.
+  single_dir="$(mktemp -d ./batch_consistency.XXXXXX)"
+  batch_dir="$(mktemp -d ./batch_consistency.XXXXXX)"
+  jobs_dir="$(mktemp -d ./batch_consistency.XXXXXX)"
+  cp -r "${directory}"/. "${single_dir}"
+  cp -r "${directory}"/. "${batch_dir}"
+  cp -r "${directory}"/. "${jobs_dir}"
+  (
+    cd "${single_dir}" || exit
+    CLOUDNET_BINDIR="${bindir}"
+    for file in "$@"
+    do
+      translate "${file}" --diagnostics-file diagnostics.json > /dev/null 2>&1
+    done
+  )
+  (
+    cd "${batch_dir}" || exit
+    CLOUDNET_BINDIR="${bindir}"
+    translate "$@" --diagnostics-file diagnostics.json > /dev/null 2>&1
+  )
+  (
+    cd "${jobs_dir}" || exit
+    CLOUDNET_BINDIR="${bindir}"
+    TOSCAWARE_OPTS="--jobs 2" translate "$@" --diagnostics-file diagnostics.json > /dev/null 2>&1
+  )
+  if [ -f "${batch_dir}"/diagnostics.json ] && [ -f "${jobs_dir}"/diagnostics.json ] \
+    && diff -r "${single_dir}" "${batch_dir}" > /tmp/cloudnet_batch_consistency.log \
+    && diff -r "${single_dir}" "${jobs_dir}" >> /tmp/cloudnet_batch_consistency.log
+  then
+    echo -e "${GREEN}No regression in batch translation of $*${RESET}"
+  else
+    cat /tmp/cloudnet_batch_consistency.log
+    echo -e "${RED}Regression in batch translation of $*!${RESET}"
+    exit_code=1
+  fi
+  rm -rf "${single_dir}" "${batch_dir}" "${jobs_dir}"
+}
+
 # YAML parsing
 for file in $(ls yaml_parsing/*.yaml)
 do
@@ -74,4 +121,74 @@ check_regression issues/issue_54.yaml
 check_regression issues/issue_55.yaml
 check_regression issues/issue_56.yaml
 
+# Batch translation
+check_batch_consistency ../examples/ariatosca/tosca-simple-1.0/use-cases/multi-tier-1 \
+  custom_types/logstash.yaml custom_types/logstash.yaml
+check_batch_consistency ../examples/ariatosca/tosca-simple-1.0/use-cases/multi-tier-1 \
+  multi-tier-1.yaml custom_types/collectd.yaml custom_types/elasticsearch.yaml \
+  custom_types/kibana.yaml custom_types/logstash.yaml custom_types/rsyslog.yaml
+check_batch_consistency ../examples/OASIS_TOSCA_1.2 \
+  WebServer-DBMS-1.yaml WebServer-DBMS-2.yaml example-2-3.yaml cyclic-dependencies.yaml
+check_batch_consistency ../examples/TOSCA_1.3_NFV_Topology TopologyVNFD.yaml TopologyNSD.yaml
+
+# Compiled TOSCA schemas
+if PYTHONPATH=../bin python3 schema_compiler.py > /tmp/cloudnet_schema_compiler.log 2>&1
+then
+  echo -e "${GREEN}No regression in compiled TOSCA schemas${RESET}"
+else
+  cat /tmp/cloudnet_schema_compiler.log
+  echo -e "${RED}Regression in compiled TOSCA schemas!${RESET}"
+  exit_code=1
+fi
+
+# Incremental translation
+if PYTHONPATH=../bin python3 build_manifest.py > /tmp/cloudnet_build_manifest.log 2>&1
+then
+  echo -e "${GREEN}No regression in incremental translation${RESET}"
+else
+  cat /tmp/cloudnet_build_manifest.log
+  echo -e "${RED}Regression in incremental translation!${RESET}"
+  exit_code=1
+fi
+
+# YAML cache
+if PYTHONPATH=../bin python3 yaml_cache.py > /tmp/cloudnet_yaml_cache.log 2>&1
+then
+  echo -e "${GREEN}No regression in YAML cache${RESET}"
+else
+  cat /tmp/cloudnet_yaml_cache.log
+  echo -e "${RED}Regression in YAML cache!${RESET}"
+  exit_code=1
+fi
+
+# Prefetching of HTTP imports
+if PYTHONPATH=../bin python3 prefetch.py > /tmp/cloudnet_prefetch.log 2>&1
+then
+  echo -e "${GREEN}No regression in prefetching of HTTP imports${RESET}"
+else
+  cat /tmp/cloudnet_prefetch.log
+  echo -e "${RED}Regression in prefetching of HTTP imports!${RESET}"
+  exit_code=1
+fi
+
+# HTTP cache
+if PYTHONPATH=../bin python3 http_cache.py > /tmp/cloudnet_http_cache.log 2>&1
+then
+  echo -e "${GREEN}No regression in HTTP cache${RESET}"
+else
+  cat /tmp/cloudnet_http_cache.log
+  echo -e "${RED}Regression in HTTP cache!${RESET}"
+  exit_code=1
+fi
+
+# Modules imported only when needed
+if (cd benchmarks && PYTHONPATH=../../bin python3 startup_time.py 1) > /tmp/cloudnet_startup_time.log 2>&1
+then
+  echo -e "${GREEN}No regression in lazy imports${RESET}"
+else
+  cat /tmp/cloudnet_startup_time.log
+  echo -e "${RED}Regression in lazy imports!${RESET}"
+  exit_code=1
+fi
+
 exit ${exit_code}
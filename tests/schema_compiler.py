@@ -0,0 +1,142 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Tests for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Differential test of the compiled TOSCA schemas against jsonschema.
+
+Usage, from the tests directory:
+    PYTHONPATH=../bin python3 schema_compiler.py [<mutants per template>]
+
+The templates of the tests and of the examples, and randomly mutated copies
+of them, are checked with the compiled validity check of their TOSCA schema
+and with jsonschema.Draft4Validator. The exit status is 1 if they disagree on
+a template, as invalid templates would then be reported as valid.
+"""
+
+import copy
+import glob
+import os
+import random
+import sys
+
+import cloudnet.tosca.configuration as configuration
+import cloudnet.tosca.importers as importers
+import cloudnet.tosca.syntax as syntax
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_FILES = sorted(
+    glob.glob(os.path.join(DIRECTORY, "*.yaml"))
+    + glob.glob(os.path.join(DIRECTORY, "issues/*.yaml"))
+    + glob.glob(os.path.join(DIRECTORY, "../examples/**/*.yaml"), recursive=True)
+)
+
+# Values replacing mutated values, of every JSON type.
+REPLACEMENTS = [None, True, 0, -1, 1.5, "", "x", "1.0.0", [], ["x"], {}, {"x": 1}]
+
+
+def get_paths(value, path=()):
+    """
+    Returns the paths of all the values of a YAML tree.
+    """
+    result = [path]
+    if isinstance(value, dict):
+        for key, item in value.items():
+            result.extend(get_paths(item, path + (key,)))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            result.extend(get_paths(item, path + (index,)))
+    return result
+
+
+def mutate(template_yaml, rng):
+    """
+    Returns a copy of a template where a random value is replaced, removed,
+    extended with an unknown key or wrapped into a list.
+    """
+    result = copy.deepcopy(template_yaml)
+    path = rng.choice(get_paths(result)[1:])
+    parent = result
+    for key in path[:-1]:
+        parent = parent[key]
+    key = path[-1]
+    operation = rng.randrange(4)
+    if operation == 0:
+        parent[key] = copy.deepcopy(rng.choice(REPLACEMENTS))
+    elif operation == 1:
+        del parent[key]
+    elif operation == 2 and isinstance(parent[key], dict):
+        parent[key]["unknown_keyword"] = rng.choice(REPLACEMENTS)
+    else:
+        parent[key] = [parent[key]]
+    return result
+
+
+def main(argv):
+    mutants = int(argv[0]) if len(argv) > 0 else 20
+    schema_files = configuration.DEFAULT_CONFIGURATION[syntax.SYNTAX][
+        syntax.TOSCA_DEFINITIONS_VERSION
+    ]
+    default_version = configuration.DEFAULT_CONFIGURATION[syntax.SYNTAX][
+        syntax.DEFAULT_TOSCA_DEFINITIONS_VERSION
+    ]
+    import_session = importers.ImportSession()
+    rng = random.Random(0)
+
+    status = 0
+    nb_checks = nb_invalid = 0
+    for template_file in TEMPLATE_FILES:
+        if os.path.basename(template_file) == "tosca2cloudnet.yaml":
+            continue
+        try:
+            with open(template_file, "rb") as stream:
+                template_yaml = importers.parse_yaml(stream.read())
+        except Exception:
+            continue  # not parsable.
+        if not isinstance(template_yaml, dict):
+            continue
+        # The default version is used as by the syntax checker.
+        version = template_yaml.get(syntax.TOSCA_DEFINITIONS_VERSION)
+        schema_file = schema_files.get(
+            version if isinstance(version, str) else default_version,
+            schema_files[default_version],
+        )
+        tosca_schema = import_session.imports(schema_file).get_yaml()
+        validator, is_valid = syntax.get_validator(schema_file, tosca_schema)
+        if is_valid is None:
+            print("%s not compiled" % schema_file)
+            return 1
+        instances = [template_yaml]
+        if len(get_paths(template_yaml)) > 1:
+            instances.extend(mutate(template_yaml, rng) for _ in range(mutants))
+        for instance in instances:
+            expected = validator.is_valid(instance)
+            if is_valid(instance) != expected:
+                print(
+                    "%s: compiled check %s, jsonschema %s for %.200r"
+                    % (
+                        os.path.relpath(template_file, DIRECTORY),
+                        not expected,
+                        expected,
+                        instance,
+                    )
+                )
+                status = 1
+            nb_checks += 1
+            nb_invalid += not expected
+    print("%d templates checked, %d invalid" % (nb_checks, nb_invalid))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
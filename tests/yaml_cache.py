@@ -0,0 +1,116 @@
+######################################################################
+#
+# Software Name : Cloudnet TOSCA toolbox
+# Version: 1.0
+# SPDX-FileCopyrightText: Copyright (c) 2020-25 Orange
+# SPDX-License-Identifier: Apache-2.0
+#
+# This software is distributed under the Apache License 2.0
+# the text of which is available at http://www.apache.org/licenses/LICENSE-2.0
+# or see the "LICENSE-2.0.txt" file for more details.
+#
+# Software description: Tests for TOSCA to Cloudnet Translator
+######################################################################
+
+"""
+Test of the persistent cache of parsed YAML files.
+
+Usage, from the tests directory:
+    PYTHONPATH=../bin python3 yaml_cache.py
+
+YAML contents are loaded through the cache while they are not cached, cached,
+modified, cached by another loader or PyYAML version, and cached in a corrupt
+file. The exit status is 1 if contents are not parsed again when expected, or
+if loaded contents and their coordinates differ from parsed ones.
+"""
+
+import os
+import sys
+import tempfile
+
+import yaml
+
+import cloudnet.tosca.importers as importers
+
+CONTENT = b"""\
+tosca_definitions_version: tosca_simple_yaml_1_3
+node_types:
+  Server:
+    derived_from: tosca.nodes.Compute
+"""
+
+
+def get_coordinates(value):
+    """
+    Returns a YAML tree with the line and column of each of its values.
+    """
+    if isinstance(value, dict):
+        items = [(key, get_coordinates(item)) for key, item in value.items()]
+    elif isinstance(value, list):
+        items = [get_coordinates(item) for item in value]
+    else:
+        items = value
+    return (items, getattr(value, "line", None), getattr(value, "column", None))
+
+
+def main(argv):
+    cache = importers.YamlCache(tempfile.mkdtemp())
+    parsed_contents = []
+    safe_line_load = importers.safe_line_load
+
+    def parse(content):
+        parsed_contents.append(content)
+        return safe_line_load(content)
+
+    importers.safe_line_load = parse
+
+    def corrupt():
+        with open(cache.get_filename(CONTENT), "wb") as stream:
+            stream.write(b"corrupt")
+
+    def set_loader_version(version):
+        importers.LOADER_VERSION = version
+
+    def set_yaml_version(version):
+        yaml.__version__ = version
+
+    loader_version = importers.LOADER_VERSION
+    yaml_version = yaml.__version__
+    modified_content = CONTENT + b"    description: modified\n"
+
+    status = 0
+    # Each step loads a content and tells whether it must be parsed.
+    for title, step, content, parsed in [
+        ("not cached", lambda: None, CONTENT, True),
+        ("cached", lambda: None, CONTENT, False),
+        ("modified", lambda: None, modified_content, True),
+        ("unmodified", lambda: None, CONTENT, False),
+        ("other loader", lambda: set_loader_version(loader_version + 1), CONTENT, True),
+        ("previous loader", lambda: set_loader_version(loader_version), CONTENT, False),
+        ("other PyYAML", lambda: set_yaml_version(yaml_version + ".0"), CONTENT, True),
+        ("previous PyYAML", lambda: set_yaml_version(yaml_version), CONTENT, False),
+        ("corrupt", corrupt, CONTENT, True),
+        ("recovered", lambda: None, CONTENT, False),
+    ]:
+        step()
+        parsed_contents.clear()
+        coordinates = get_coordinates(cache.load(content))
+        expected = get_coordinates(safe_line_load(content))
+        if parsed_contents == ([content] if parsed else []) and coordinates == expected:
+            print("%s: ok" % title)
+        else:
+            print(
+                "%s: %s instead of %s"
+                % (
+                    title,
+                    "parsed" if parsed_contents else "not parsed",
+                    "parsed" if parsed else "not parsed",
+                )
+            )
+            status = 1
+    print("%d cache files" % len(os.listdir(cache.directory)))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))